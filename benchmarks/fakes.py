@@ -0,0 +1,327 @@
+"""
+Local stand-ins for the external services the pipelines talk to.
+
+FakeServer is a threaded HTTP server answering the FRED observations API, the
+Federal Register documents/facets API and static product pages, counting
+requests and response bytes. FakeSpreadsheet/FakeWorksheet implement the subset
+of gspread used in this repo in memory, counting every API-equivalent call.
+"""
+
+import bisect
+import json
+import math
+import re
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from gspread.exceptions import WorksheetNotFound
+
+
+# ==== HTTP ====
+class FakeServer:
+    def __init__(self, fred: Dict[str, List[Dict]], documents: List[Dict], pages: Dict[str, str]):
+        self.fred = fred
+        self.documents = documents
+        self.doc_dates = [d["publication_date"] for d in documents]
+        self.pages = pages
+        self.requests = 0
+        self.bytes_out = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._httpd.server_port}"
+
+    def start(self) -> "FakeServer":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def reset_counters(self):
+        with self._lock:
+            self.requests = 0
+            self.bytes_out = 0
+
+    def _count(self, nbytes: int):
+        with self._lock:
+            self.requests += 1
+            self.bytes_out += nbytes
+
+    # ---- routes ----
+    def _fred(self, q: Dict[str, List[str]]):
+        obs = self.fred.get(q.get("series_id", [""])[0])
+        if obs is None:
+            return 400, {"error_message": "Bad Request. The series does not exist."}
+        lo = q.get("observation_start", ["0000"])[0]
+        hi = q.get("observation_end", ["9999"])[0]
+        return 200, {"observations": [o for o in obs if lo <= o["date"] <= hi]}
+
+    def _docs_in_range(self, q):
+        lo = q.get("conditions[publication_date][gte]", ["0000"])[0]
+        hi = q.get("conditions[publication_date][lte]", ["9999"])[0]
+        doc_type = q.get("conditions[type]", [None])[0]
+        i = bisect.bisect_left(self.doc_dates, lo)
+        j = bisect.bisect_right(self.doc_dates, hi)
+        docs = self.documents[i:j]
+        if doc_type:
+            docs = [d for d in docs if d["type"] == doc_type]
+        return docs
+
+    def _fr_documents(self, q):
+        docs = self._docs_in_range(q)
+        per_page = min(int(q.get("per_page", ["20"])[0]), 1000)
+        page = int(q.get("page", ["1"])[0])
+        fields = q.get("fields[]")
+        results = docs[(page - 1) * per_page:page * per_page]
+        if fields:
+            results = [{k: d[k] for k in fields if k in d} for d in results]
+        return 200, {"count": len(docs), "total_pages": math.ceil(len(docs) / per_page), "results": results}
+
+    def _fr_daily(self, q):
+        counts = Counter(d["publication_date"] for d in self._docs_in_range(q))
+        return 200, {day: {"count": n, "name": day} for day, n in sorted(counts.items())}
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                u = urlparse(self.path)
+                q = parse_qs(u.query)
+                ctype = "application/json"
+                if u.path.endswith("/fred/series/observations"):
+                    status, payload = server._fred(q)
+                elif u.path.endswith("/documents.json"):
+                    status, payload = server._fr_documents(q)
+                elif u.path.endswith("/documents/facets/daily"):
+                    status, payload = server._fr_daily(q)
+                elif u.path in server.pages:
+                    status, payload, ctype = 200, server.pages[u.path], "text/html; charset=utf-8"
+                else:
+                    status, payload = 404, {"error": "not found"}
+                body = payload.encode("utf-8") if isinstance(payload, str) else json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                server._count(len(body))
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+# ==== Google Sheets ====
+_CELL_RE = re.compile(r"^([A-Z]*)(\d*)$")
+
+def _col_index(letters: str) -> int:
+    n = 0
+    for ch in letters:
+        n = n * 26 + (ord(ch) - 64)
+    return n
+
+def parse_a1(rng: str):
+    """'A5:F6' / 'A1' / '5:6' / 'Tab!A1:B2' -> (row1, col1, row2|None, col2|None), 1-based."""
+    rng = rng.split("!")[-1].strip("'")
+    first, _, last = rng.partition(":")
+    c1, r1 = _CELL_RE.match(first).groups()
+    row1, col1 = int(r1 or 1), _col_index(c1) if c1 else 1
+    if not last:
+        return row1, col1, None, None
+    c2, r2 = _CELL_RE.match(last).groups()
+    return row1, col1, int(r2) if r2 else None, _col_index(c2) if c2 else None
+
+def _fmt(v) -> str:
+    if isinstance(v, float) and v.is_integer():
+        return str(int(v))
+    return "" if v is None else str(v)
+
+def _numericise(v):
+    if not isinstance(v, str) or v == "":
+        return v
+    try:
+        return int(v)
+    except ValueError:
+        try:
+            return float(v)
+        except ValueError:
+            return v
+
+
+class FakeWorksheet:
+    def __init__(self, spreadsheet: "FakeSpreadsheet", title: str, rows: Optional[List[List]] = None):
+        self.spreadsheet = spreadsheet
+        self.title = title
+        self.id = len(spreadsheet._tabs)
+        self.col_count = 26
+        self.rows: List[List] = [list(r) for r in (rows or [])]
+
+    def _call(self, name: str):
+        self.spreadsheet.calls[name] += 1
+
+    @property
+    def row_count(self) -> int:
+        return max(1000, len(self.rows))
+
+    def _slice(self, rng: str, formatted: bool) -> List[List]:
+        r1, c1, r2, c2 = parse_a1(rng)
+        out = []
+        for row in self.rows[r1 - 1:(r2 if r2 else len(self.rows))]:
+            cells = row[c1 - 1:(c2 if c2 else len(row))]
+            while cells and cells[-1] in ("", None):
+                cells = cells[:-1]
+            out.append([_fmt(c) for c in cells] if formatted else list(cells))
+        while out and not out[-1]:
+            out.pop()
+        return out
+
+    def get_all_values(self, **kwargs) -> List[List[str]]:
+        self._call("values_get")
+        return [[_fmt(c) for c in row] for row in self.rows]
+
+    def get_all_records(self, **kwargs) -> List[Dict]:
+        self._call("values_get")
+        if not self.rows:
+            return []
+        header = [_fmt(h) for h in self.rows[0]]
+        return [{h: _numericise(_fmt(c)) for h, c in zip(header, row + [""] * len(header))} for row in self.rows[1:]]
+
+    def get(self, rng: str, value_render_option=None, **kwargs) -> List[List]:
+        self._call("values_get")
+        return self._slice(rng, formatted=value_render_option != "UNFORMATTED_VALUE")
+
+    def col_values(self, col: int, **kwargs) -> List[str]:
+        self._call("values_get")
+        vals = [_fmt(row[col - 1]) if len(row) >= col else "" for row in self.rows]
+        while vals and vals[-1] == "":
+            vals.pop()
+        return vals
+
+    def row_values(self, row: int, **kwargs) -> List[str]:
+        self._call("values_get")
+        return [_fmt(c) for c in self.rows[row - 1]] if row <= len(self.rows) else []
+
+    def _write(self, rng: str, values: List[List]):
+        r1, c1, _, _ = parse_a1(rng)
+        for i, vals in enumerate(values):
+            idx = r1 - 1 + i
+            while len(self.rows) <= idx:
+                self.rows.append([])
+            row = self.rows[idx]
+            if len(row) < c1 - 1 + len(vals):
+                row.extend([""] * (c1 - 1 + len(vals) - len(row)))
+            row[c1 - 1:c1 - 1 + len(vals)] = list(vals)
+
+    def update(self, *args, range_name: Optional[str] = None, values=None, **kwargs):
+        # Accept both update(range, values) and update(values, range) call styles
+        for a in args:
+            if isinstance(a, str):
+                range_name = a
+            else:
+                values = a
+        self._call("values_update")
+        self._write(range_name or "A1", values or [])
+
+    def batch_update(self, data: List[Dict], **kwargs):
+        self._call("values_batch_update")
+        for item in data:
+            self._write(item["range"], item["values"])
+
+    def clear(self):
+        self._call("values_clear")
+        self.rows = []
+
+    def append_row(self, values: List, **kwargs):
+        self._call("values_append")
+        self.rows.append(list(values))
+
+    def append_rows(self, values: List[List], **kwargs):
+        self._call("values_append")
+        self.rows.extend(list(v) for v in values)
+
+
+# Calls that modify the spreadsheet (and so its Drive modifiedTime)
+WRITE_CALLS = ("values_update", "values_batch_update", "values_clear", "values_append",
+               "batch_update", "values_batch_clear")
+
+
+class FakeSpreadsheet:
+    def __init__(self, tabs: Optional[Dict[str, List[List]]] = None):
+        self.calls: Counter = Counter()
+        self._tabs: Dict[str, FakeWorksheet] = {}
+        for title, rows in (tabs or {}).items():
+            self._tabs[title] = FakeWorksheet(self, title, rows)
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+    def get_lastUpdateTime(self) -> str:
+        # Stands in for the Drive modifiedTime: changes with every write call
+        self.calls["drive_get"] += 1
+        return f"rev-{sum(self.calls[c] for c in WRITE_CALLS)}"
+
+    def worksheet(self, title: str) -> FakeWorksheet:
+        self.calls["metadata_get"] += 1
+        if title not in self._tabs:
+            raise WorksheetNotFound(title)
+        return self._tabs[title]
+
+    def worksheets(self) -> List[FakeWorksheet]:
+        self.calls["metadata_get"] += 1
+        return list(self._tabs.values())
+
+    def add_worksheet(self, title: str, rows=None, cols=None, **kwargs) -> FakeWorksheet:
+        self.calls["batch_update"] += 1
+        ws = self._tabs[title] = FakeWorksheet(self, title)
+        return ws
+
+    def del_worksheet(self, ws: FakeWorksheet):
+        self.calls["batch_update"] += 1
+        self._tabs.pop(ws.title, None)
+
+    def values_batch_get(self, ranges: List[str], params: Optional[Dict] = None) -> Dict:
+        self.calls["values_batch_get"] += 1
+        unformatted = (params or {}).get("valueRenderOption") == "UNFORMATTED_VALUE"
+        out = []
+        for rng in ranges:
+            title, _, cells = rng.partition("!")
+            title = title.strip("'").replace("''", "'")
+            if title not in self._tabs:
+                raise WorksheetNotFound(title)
+            out.append({"range": rng, "values": self._tabs[title]._slice(cells or "A1", formatted=not unformatted)})
+        return {"valueRanges": out}
+
+    def batch_update(self, body: Dict) -> Dict:
+        self.calls["batch_update"] += 1
+        for req in body.get("requests", []):
+            if "addSheet" in req:
+                title = req["addSheet"]["properties"]["title"]
+                self._tabs[title] = FakeWorksheet(self, title)
+        return {}
+
+    def values_batch_clear(self, params: Optional[Dict] = None, body: Optional[Dict] = None) -> Dict:
+        self.calls["values_batch_clear"] += 1
+        for rng in (body or {}).get("ranges", []):
+            self._tabs[rng.partition("!")[0].strip("'").replace("''", "'")].rows = []
+        return {}
+
+    def values_batch_update(self, body: Dict, **kwargs) -> Dict:
+        self.calls["values_batch_update"] += 1
+        for item in body.get("data", []):
+            title, _, cells = item["range"].partition("!")
+            self._tabs[title.strip("'").replace("''", "'")]._write(cells or "A1", item["values"])
+        return {}
@@ -0,0 +1,121 @@
+"""
+Deterministic, scalable fixtures for the offline benchmarks.
+
+Everything is generated from a seed, so two runs with the same arguments see
+byte-identical data: FRED observation histories, Federal Register documents,
+retail product pages and the seeded contents of the stand-in spreadsheet.
+"""
+
+import random
+from datetime import date, timedelta
+from typing import Dict, List
+
+# series_id -> (frequency, start level, daily volatility)
+FRED_SERIES = {
+    "APU0000708111": ("monthly", 1.5, 0.04),
+    "GASREGW": ("weekly", 2.2, 0.02),
+    "DGS10": ("business", 1.0, 0.02),
+    "SP500": ("business", 3700.0, 0.01),
+}
+
+AGENCIES = [
+    "Environmental Protection Agency", "Federal Aviation Administration", "Food and Drug Administration",
+    "Securities and Exchange Commission", "Department of Energy", "Federal Communications Commission",
+    "Internal Revenue Service", "Federal Reserve System", "Department of Labor", "Department of Transportation",
+]
+FR_TYPES = ["PRORULE", "RULE", "NOTICE"]
+WORDS = (
+    "proposed rule amendment airworthiness emissions standards reporting requirements "
+    "energy efficiency safety market disclosure labor wage broadband spectrum tariff "
+    "import export pipeline hazardous materials aviation maintenance inspection program "
+    "public comment regulatory flexibility economic impact small entities"
+).split()
+
+
+def _dates(freq: str, start: date, end: date) -> List[date]:
+    out = []
+    d = start
+    while d <= end:
+        if freq == "monthly":
+            out.append(d)
+            d = date(d.year + (d.month // 12), d.month % 12 + 1, 1)
+            continue
+        if freq == "weekly":
+            out.append(d)
+            d += timedelta(days=7)
+            continue
+        if d.weekday() < 5:
+            out.append(d)
+        d += timedelta(days=1)
+    return out
+
+def fred_observations(years: int, end: date, seed: int = 1) -> Dict[str, List[Dict]]:
+    """
+    {series_id: [{"date", "value"}, ...]} covering `years` years up to `end`,
+    as FRED returns them (values are strings; a few '.' gaps for holidays).
+    """
+    rng = random.Random(seed)
+    start = date(end.year - years, end.month, 1)
+    out: Dict[str, List[Dict]] = {}
+    for sid, (freq, level, vol) in FRED_SERIES.items():
+        obs = []
+        v = level
+        for d in _dates(freq, start, end):
+            v = max(0.01, v * (1 + rng.gauss(0, vol)))
+            value = "." if rng.random() < 0.01 else f"{v:.3f}"
+            obs.append({"date": d.isoformat(), "value": value})
+        out[sid] = obs
+    return out
+
+def policy_documents(count: int, start: date, end: date, seed: int = 2) -> List[Dict]:
+    """
+    `count` Federal Register documents spread over [start..end] (weekdays only),
+    sorted by publication date, shaped like the documents.json API results.
+    """
+    rng = random.Random(seed)
+    days = [d for d in _dates("business", start, end)] or [start]
+    docs = []
+    for i in range(count):
+        d = days[rng.randrange(len(days))]
+        number = f"{d.year}-{i:06d}"
+        title = " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 12))).capitalize()
+        abstract = " ".join(rng.choice(WORDS) for _ in range(rng.randint(30, 120)))
+        docs.append({
+            "document_number": number,
+            "publication_date": d.isoformat(),
+            "type": rng.choice(FR_TYPES),
+            "title": title,
+            "abstract": abstract,
+            "agencies": [{"name": a} for a in rng.sample(AGENCIES, rng.randint(1, 2))],
+            "html_url": f"https://www.federalregister.gov/documents/{d:%Y/%m/%d}/{number}/doc",
+        })
+    docs.sort(key=lambda doc: (doc["publication_date"], doc["document_number"]))
+    return docs
+
+def product_page(name: str, price: float, size_kb: int = 400, seed: int = 3) -> str:
+    """
+    A large retail-like page with the price node near the end (worst case for a scan).
+    """
+    rng = random.Random(f"{seed}-{name}")
+    filler = []
+    total = 0
+    while total < size_kb * 1024:
+        chunk = '<div class="tile"><a href="/p/{0}">{1}</a></div>\n'.format(
+            rng.randrange(10 ** 6), " ".join(rng.choice(WORDS) for _ in range(8)))
+        filler.append(chunk)
+        total += len(chunk)
+    return (
+        "<html><head><title>{0}</title></head><body>{1}"
+        '<span class="rc-price as-price-currentprice"><span>From ${2:,.2f}</span></span>'
+        '<div class="overview-cost__pricing-summary"><p>MSRP</p><span>${2:,.0f}</span></div>'
+        "</body></html>"
+    ).format(name, "".join(filler), price)
+
+def daily_price_rows(first: date, end: date, header: List[str], base: List, price: float) -> List[List]:
+    """Daily rolled-over price history for a price tab, header row first."""
+    rows = [header]
+    d = first
+    while d <= end:
+        rows.append([d.isoformat()] + base + [price])
+        d += timedelta(days=1)
+    return rows
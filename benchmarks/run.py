@@ -0,0 +1,198 @@
+"""
+Offline benchmark for the data pipelines.
+
+Runs data_updater, policy_tracker, price_scraper, sheets_mirror and snapshot_to_json in-process
+against benchmarks.fakes (local HTTP server + in-memory spreadsheet) seeded with
+benchmarks.fixtures, in a scratch working directory. Each pipeline runs
+--runs times (the first run is cold; later runs exercise incremental paths)
+and reports wall time, HTTP requests, response bytes, Sheets calls and peak
+Python heap.
+
+Usage:
+  python -m benchmarks.run [--years 10] [--policy-docs 20000] [--products 2] [--extra-fred 0]
+                           [--page-kb 400] [--runs 2] [--only fred,policy]
+                           [--json results.json]
+"""
+
+import argparse
+import importlib
+import json
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from benchmarks import fixtures  # noqa: E402
+from benchmarks.fakes import FakeServer, FakeSpreadsheet  # noqa: E402
+
+PIPELINES = ["fred", "policy", "prices", "mirror", "snapshot"]
+EXTRA_PIPELINES = ["pipeline"]  # opt-in via --only: every stage through updater.pipeline
+SHEET_ID = "benchmark-sheet"
+
+
+def register_extra_fred(count: int):
+    """Add `count` synthetic FRED series to the series registry and the fixtures."""
+    import series_registry
+
+    for i in range(count):
+        sid = f"BENCH{i:03d}"
+        fixtures.FRED_SERIES[sid] = ("business", 100.0, 0.01)
+        series_registry.SERIES.append({
+            "tab": f"Bench_{i:03d}", "source": "fred", "series_id": sid, "header": ["Date", "Value"],
+            "description": f"Benchmark series {i}", "provider": "FRED", "units": "Index",
+            "details": f"Series {sid}", "source_url": "", "note": "benchmark",
+        })
+
+
+def fresh_import(name: str):
+    """Import a pipeline module from scratch so it re-reads its environment."""
+    sys.modules.pop(name, None)
+    return importlib.import_module(name)
+
+def seed_spreadsheet(years: int, today: date, products: int) -> FakeSpreadsheet:
+    first = date(today.year - years, today.month, 1)
+    from series_registry import fred_series
+
+    tabs = {s["tab"]: [s["header"]] for s in fred_series()}
+    tabs["iPhone_Prices"] = fixtures.daily_price_rows(
+        first, today, ["Date", "Model", "Storage", "Price (USD)"], ["iPhone 15", "128GB"], 799)
+    tabs["Car_Prices"] = fixtures.daily_price_rows(
+        first, today, ["Date", "Make", "Model", "Model Year", "Trim", "Price (USD)"],
+        ["Toyota", "RAV4", today.year, "XLE"], 31380)
+    for i in range(2, products):
+        tabs[f"Product_{i:03d}"] = [["Date", "Product", "Price (USD)"], [first.isoformat(), f"Product {i}", 100 + i]]
+    tabs["Policy_Events"] = []
+    tabs["Metadata"] = [["Sheet Name", "Description", "Source", "Units", "Frequency", "Source URL"]]
+    return FakeSpreadsheet(tabs)
+
+def price_targets(price_scraper, server: FakeServer, products: int):
+    base = price_scraper.SCRAPE_TARGETS
+    targets = [dict(t, url=f"{server.url}/shop/{t['name']}") for t in base[:products]]
+    for i in range(len(base), products):
+        targets.append(dict(base[0], name=f"product{i}", tab=f"Product_{i:03d}", url=f"{server.url}/shop/product{i}"))
+    return targets
+
+def run_pipeline(name: str, run: int, server: FakeServer, today: date, args):
+    import log_update_notes
+
+    if name == "fred":
+        fresh_import("data_updater").main()
+    elif name == "policy":
+        if run == 0:
+            os.environ["START_DATE"] = (today - timedelta(days=365 * args.years)).isoformat()
+        else:
+            os.environ.pop("START_DATE", None)  # resume from the local store
+        fresh_import("policy_tracker").main()
+    elif name == "prices":
+        price_scraper = fresh_import("price_scraper")
+        price_scraper.SCRAPE_TARGETS[:] = price_targets(price_scraper, server, args.products)
+        price_scraper.main()
+    elif name == "mirror":
+        fresh_import("sheets_mirror").mirror()
+    elif name == "snapshot":
+        fresh_import("snapshot_to_json").main()
+    elif name == "pipeline":
+        # all stages through the unified runner (python -m updater run)
+        os.environ.pop("START_DATE", None)
+        price_scraper = fresh_import("price_scraper")
+        price_scraper.SCRAPE_TARGETS[:] = price_targets(price_scraper, server, args.products)
+        for mod in ("data_updater", "policy_tracker", "snapshot_to_json", "update_metadata_entries"):
+            fresh_import(mod)
+        from updater.pipeline import run as run_stages
+        failed = {k: v["error"] for k, v in run_stages().items() if not v["ok"]}
+        if failed:
+            raise RuntimeError(f"pipeline stages failed: {failed}")
+    log_update_notes.flush_updates()
+
+def measure(fn, server: FakeServer, sheet: FakeSpreadsheet):
+    server.reset_counters()
+    calls_before = sheet.total_calls
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    fn()
+    wall = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "wall_s": round(wall, 3),
+        "requests": server.requests,
+        "bytes": server.bytes_out,
+        "sheets_calls": sheet.total_calls - calls_before,
+        "peak_heap_mb": round(peak / 2 ** 20, 1),
+    }
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--years", type=int, default=10, help="years of FRED/price history")
+    ap.add_argument("--policy-docs", type=int, default=20000, help="Federal Register documents in the fixture")
+    ap.add_argument("--products", type=int, default=2, help="scrape targets (2 = the real registry)")
+    ap.add_argument("--extra-fred", type=int, default=0, help="synthetic FRED series added to the registry")
+    ap.add_argument("--page-kb", type=int, default=400, help="size of each product page")
+    ap.add_argument("--runs", type=int, default=2, help="runs per pipeline (first is cold)")
+    ap.add_argument("--only", default=",".join(PIPELINES), help=f"comma list of pipelines (also: {', '.join(EXTRA_PIPELINES)})")
+    ap.add_argument("--json", help="also write results to this file")
+    ap.add_argument("--keep", action="store_true", help="keep the scratch directory")
+    args = ap.parse_args(argv)
+
+    today = date.today()
+    register_extra_fred(args.extra_fred)
+    fred = fixtures.fred_observations(args.years, today)
+    docs = fixtures.policy_documents(args.policy_docs, today - timedelta(days=365 * args.years), today)
+    pages = {f"/shop/{t}": fixtures.product_page(t, 799 + i, args.page_kb)
+             for i, t in enumerate(["iphone", "rav4"] + [f"product{i}" for i in range(2, args.products)])}
+    server = FakeServer(fred, docs, pages).start()
+    sheet = seed_spreadsheet(args.years, today, args.products)
+
+    workdir = tempfile.mkdtemp(prefix="edu-bench-")
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    os.environ.update({
+        "FRED_API_KEY": "benchmark",
+        "FRED_BASE_URL": f"{server.url}/fred/series/observations",
+        "FR_API_ROOT": f"{server.url}/fr/api/v1",
+        "FR_TYPES": ",".join(fixtures.FR_TYPES),
+        "FR_RATE_LIMIT": "1000",
+        "GOOGLE_SHEET_ID": SHEET_ID,
+        "GOOGLE_CREDENTIALS": "{}",
+        "HTTP_CACHE_MODE": "off",
+    })
+
+    import sheets_client
+    sheets_client.reset()
+    sheets_client.register_spreadsheet(sheet, SHEET_ID)
+
+    results = []
+    try:
+        for name in [p.strip() for p in args.only.split(",") if p.strip()]:
+            for run in range(args.runs):
+                m = measure(lambda: run_pipeline(name, run, server, today, args), server, sheet)
+                m.update(pipeline=name, run=run)
+                results.append(m)
+    finally:
+        os.chdir(cwd)
+        server.stop()
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"\n{'pipeline':<10} {'run':>3} {'wall s':>8} {'requests':>9} {'MB in':>8} {'sheets':>7} {'heap MB':>8}")
+    for m in results:
+        print(f"{m['pipeline']:<10} {m['run']:>3} {m['wall_s']:>8.3f} {m['requests']:>9} "
+              f"{m['bytes'] / 2 ** 20:>8.2f} {m['sheets_calls']:>7} {m['peak_heap_mb']:>8.1f}")
+    # ru_maxrss is KiB on Linux
+    print(f"\nprocess peak RSS: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MB")
+    if args.keep:
+        print(f"scratch directory: {workdir}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
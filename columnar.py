@@ -0,0 +1,135 @@
+"""
+Compact columnar snapshot format for docs/data.
+
+A table of records becomes parallel per-column arrays, each stored with the
+cheapest of three encodings:
+
+  plain       {"enc": "plain", "values": [...]}
+  rle         {"enc": "rle", "values": [v0, v1, ...], "runs": [n0, n1, ...]}
+              value vi repeated ni times (constant spans collapse to one entry)
+  date-delta  {"enc": "date-delta", "start": "YYYY-MM-DD", "values": [...], "runs": [...]}
+              day offsets between consecutive dates, themselves run-length encoded,
+              so a daily series is one run: values=[1], runs=[n-1]
+
+Document layout:
+  {"format": "columnar-rle", "version": 1, "rows": n, "columns": [...], "data": {col: enc}}
+
+Files are written compactly. Precompressed siblings are opt-in with
+COLUMNAR_COMPRESS ('gz', 'br' or 'gz,br'; default none): GitHub Pages
+compresses responses itself, and committed binaries churn on every change.
+They are deterministic (.br needs the optional 'brotli' package), and stale
+siblings of a disabled kind are removed.
+"""
+
+import gzip
+import io
+import json
+import os
+import re
+from datetime import date, timedelta
+from typing import Dict, List
+
+from fileio import same_content, write_atomic
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+
+FORMAT = "columnar-rle"
+VERSION = 1
+
+COMPRESS = {c.strip() for c in os.getenv("COLUMNAR_COMPRESS", "").split(",") if c.strip()}
+
+_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+def _rle(values: List):
+    vals: List = []
+    runs: List[int] = []
+    for v in values:
+        if vals and runs and vals[-1] == v and type(vals[-1]) is type(v):
+            runs[-1] += 1
+        else:
+            vals.append(v)
+            runs.append(1)
+    return vals, runs
+
+def _encode_dates(values: List[str]) -> Dict:
+    days = [date.fromisoformat(v).toordinal() for v in values]
+    deltas = [b - a for a, b in zip(days, days[1:])]
+    vals, runs = _rle(deltas)
+    return {"enc": "date-delta", "start": values[0], "values": vals, "runs": runs}
+
+def encode_column(values: List) -> Dict:
+    if values and all(isinstance(v, str) and _DATE_RE.match(v) for v in values):
+        try:
+            return _encode_dates(values)
+        except ValueError:
+            pass  # e.g. '2024-02-30'; fall through
+    vals, runs = _rle(values)
+    if len(runs) * 2 <= len(values):
+        return {"enc": "rle", "values": vals, "runs": runs}
+    return {"enc": "plain", "values": list(values)}
+
+def decode_column(enc: Dict) -> List:
+    kind = enc["enc"]
+    if kind == "plain":
+        return list(enc["values"])
+    out: List = []
+    if kind == "rle":
+        for v, n in zip(enc["values"], enc["runs"]):
+            out.extend([v] * n)
+        return out
+    if kind == "date-delta":
+        cur = date.fromisoformat(enc["start"])
+        out.append(enc["start"])
+        for d, n in zip(enc["values"], enc["runs"]):
+            for _ in range(n):
+                cur += timedelta(days=d)
+                out.append(cur.isoformat())
+        return out
+    raise ValueError(f"Unknown column encoding: {kind}")
+
+def encode_records(records: List[Dict]) -> Dict:
+    columns: List[str] = []
+    for r in records:
+        for k in r:
+            if k not in columns:
+                columns.append(k)
+    return {
+        "format": FORMAT,
+        "version": VERSION,
+        "rows": len(records),
+        "columns": columns,
+        "data": {c: encode_column([r.get(c, "") for r in records]) for c in columns},
+    }
+
+def decode_records(doc: Dict) -> List[Dict]:
+    cols = {c: decode_column(doc["data"][c]) for c in doc["columns"]}
+    return [{c: cols[c][i] for c in doc["columns"]} for i in range(doc["rows"])]
+
+def write_columnar(records: List[Dict], path: str) -> List[str]:
+    """
+    Write the columnar document plus the COLUMNAR_COMPRESS siblings (atomically);
+    returns the paths written. Nothing is rewritten when the document is unchanged.
+    """
+    raw = json.dumps(encode_records(records), separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    wanted = {"gz": "gz" in COMPRESS, "br": "br" in COMPRESS and brotli is not None}
+    for ext, on in wanted.items():
+        if not on and os.path.exists(f"{path}.{ext}"):
+            os.remove(f"{path}.{ext}")
+    siblings = [f"{path}.{ext}" for ext, on in wanted.items() if on]
+    if same_content(path, raw) and all(os.path.exists(p) for p in siblings):
+        return []
+    # The siblings go first, so a complete .col.json implies complete siblings
+    if wanted["gz"]:
+        buf = io.BytesIO()
+        # mtime=0 keeps the bytes stable across runs for unchanged content
+        with gzip.GzipFile(fileobj=buf, mode="wb", compresslevel=9, mtime=0) as gz:
+            gz.write(raw)
+        write_atomic(path + ".gz", buf.getvalue())
+    if wanted["br"]:
+        write_atomic(path + ".br", brotli.compress(raw, quality=11))
+    write_atomic(path, raw)
+    return [path] + siblings
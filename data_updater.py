@@ -1,75 +1,89 @@
-
 import os
-import json
-import requests
-import gspread
 import time
-from datetime import datetime
-from google.oauth2.service_account import Credentials
+from datetime import datetime, timedelta
+from fred_client import fetch_many
+from http_cache import cache_from_env
+from http_session import build_session
 from log_update_notes import log_update
+from series_registry import fred_series
+from series_store import open_store
+from sheets_mirror import mirror
+from telemetry import run_report, span
 
 # API keys from environment
 FRED_API_KEY = os.environ["FRED_API_KEY"]
 START_DATE = "2021-01-01"
 END_DATE = datetime.today().strftime("%Y-%m-%d")
 
-# Google Sheets auth
-scopes = [
-    "https://www.googleapis.com/auth/spreadsheets",
-    "https://www.googleapis.com/auth/drive"
-]
-creds_dict = json.loads(os.environ["GOOGLE_CREDENTIALS"])
-credentials = Credentials.from_service_account_info(creds_dict, scopes=scopes)
-gc = gspread.authorize(credentials)
-sh = gc.open_by_key(os.environ["GOOGLE_SHEET_ID"])
+# Fetch tuning (FRED allows 120 requests/minute per key)
+FRED_MAX_WORKERS = int(os.getenv("FRED_MAX_WORKERS", "4"))
+REQUEST_TIMEOUT = int(os.getenv("REQUEST_TIMEOUT", "20"))
+MAX_RETRIES = int(os.getenv("MAX_RETRIES", "5"))
 
-# Helper to update a sheet
-def update_sheet(sheet_name, header, rows, note, source_url):
-    ws = sh.worksheet(sheet_name)
-    ws.clear()
-    data = [header] + rows
-    ws.update("A1", data)
-    log_update(
-        tab_name=sheet_name,
-        row_count=len(rows),
-        update_type="full_overwrite",
-        note=note,
-        source_url=source_url
-    )
+# Observations are kept in the local series store (series_store.py) and mirrored
+# to Google Sheets afterwards (sheets_mirror.py). Each run re-requests this many
+# days before a series' last stored date to pick up revisions; FULL_REFRESH=1
+# forces a full re-download that replaces the stored history.
+REVISION_LOOKBACK_DAYS = int(os.getenv("REVISION_LOOKBACK_DAYS", "60"))
+FULL_REFRESH = os.getenv("FULL_REFRESH", "") not in ("", "0", "false")
 
-# Egg Prices
-egg_url = f"https://api.stlouisfed.org/fred/series/observations?series_id=APU0000708111&observation_start={START_DATE}&api_key={FRED_API_KEY}&file_type=json"
-egg_obs = requests.get(egg_url).json().get("observations", [])
-egg_rows = [[obs["date"], float(obs["value"])] for obs in egg_obs if obs["value"] not in [".", ""]]
-egg_rows.sort(key=lambda x: x[0])
-update_sheet("Egg_Prices", ["Date", "Price (USD per dozen)"], egg_rows,
-             "FRED data refreshed from Jan 2021", "https://fred.stlouisfed.org/series/APU0000708111")
+# Series to refresh: every 'fred' entry of the registry (one sheet tab each)
+FRED_SERIES = fred_series()
 
-# Gas Prices from FRED (original source: EIA)
-gas_url = f"https://api.stlouisfed.org/fred/series/observations?series_id=GASREGW&observation_start={START_DATE}&observation_end={END_DATE}&api_key={FRED_API_KEY}&file_type=json"
-try:
-    gas_obs = requests.get(gas_url).json().get("observations", [])
-    gas_rows = [[obs["date"], float(obs["value"])] for obs in gas_obs if obs["value"] not in [".", ""]]
-    gas_rows.sort(key=lambda x: x[0])
+def fetch_start(last_date):
+    """observation_start for a series: its last stored date minus the revision lookback."""
+    if FULL_REFRESH or not last_date:
+        return START_DATE
+    start = datetime.strptime(last_date, "%Y-%m-%d") - timedelta(days=REVISION_LOOKBACK_DAYS)
+    return max(start.strftime("%Y-%m-%d"), START_DATE)
 
-    update_sheet("Gas_Prices", ["Date", "Price (USD per gallon)"], gas_rows,
-                 "FRED gas price data (weekly) refreshed from Jan 2021",
-                 "https://fred.stlouisfed.org/series/GASREGW")
-except Exception as e:
-    print("❌ Failed to fetch or process gas prices from FRED:", str(e))
+def store_series(store, spec, rows):
+    """Write fetched rows to the local store; returns (updated, inserted)."""
+    with span("store_write", tab=spec["tab"]):
+        if FULL_REFRESH:
+            store.replace(spec["tab"], spec["header"], rows)
+            return 0, len(rows)
+        return store.upsert(spec["tab"], spec["header"], rows)
+
+def main():
+    """Refresh every FRED series into the local store; returns the names of tabs that changed."""
+    # One pooled session shared by all series; fetches run in parallel
+    session = build_session(timeout=REQUEST_TIMEOUT, max_retries=MAX_RETRIES, pool_maxsize=FRED_MAX_WORKERS,
+                            cache=cache_from_env())
+    store = open_store()
+    timeouts = {s["series_id"]: s["timeout"] for s in FRED_SERIES if "timeout" in s}
+    starts = {s["series_id"]: fetch_start(store.last_date(s["tab"])) for s in FRED_SERIES}
+    results, errors = fetch_many(
+        session, [s["series_id"] for s in FRED_SERIES], FRED_API_KEY, START_DATE, END_DATE,
+        max_workers=FRED_MAX_WORKERS, timeouts=timeouts, starts=starts,
+    )
 
-# Interest Rates
-rate_url = f"https://api.stlouisfed.org/fred/series/observations?series_id=DGS10&observation_start={START_DATE}&api_key={FRED_API_KEY}&file_type=json"
-rate_obs = requests.get(rate_url).json().get("observations", [])
-rate_rows = [[obs["date"], float(obs["value"])] for obs in rate_obs if obs["value"] not in [".", ""]]
-rate_rows.sort(key=lambda x: x[0])
-update_sheet("Interest_Rates", ["Date", "10-Year Treasury Rate (%)"], rate_rows,
-             "FRED interest rate data refreshed from Jan 2021", "https://fred.stlouisfed.org/series/DGS10")
+    changed = []
+    for spec in FRED_SERIES:
+        sid = spec["series_id"]
+        if sid in errors:
+            print(f"❌ Failed to fetch {sid} from FRED:", str(errors[sid]))
+            continue
+        try:
+            updated, inserted = store_series(store, spec, results[sid])
+        except Exception as e:
+            print(f"❌ Failed to store {spec['tab']}:", str(e))
+            continue
+        if not (updated or inserted):
+            print(f"✅ {spec['tab']}: no new observations")
+            continue
+        print(f"✅ {spec['tab']}: {updated} revised, {inserted} new rows")
+        changed.append(spec["tab"])
+        log_update(
+            tab_name=spec["tab"],
+            row_count=updated + inserted,
+            update_type="full_overwrite" if FULL_REFRESH else "incremental_upsert",
+            note=spec["note"],
+            source_url=spec["source_url"]
+        )
+    return changed
 
-# Stock Market
-stock_url = f"https://api.stlouisfed.org/fred/series/observations?series_id=SP500&observation_start={START_DATE}&api_key={FRED_API_KEY}&file_type=json"
-stock_obs = requests.get(stock_url).json().get("observations", [])
-stock_rows = [[obs["date"], float(obs["value"])] for obs in stock_obs if obs["value"] not in [".", ""]]
-stock_rows.sort(key=lambda x: x[0])
-update_sheet("Stock_Market", ["Date", "S&P 500 Index"], stock_rows,
-             "FRED S&P 500 data refreshed from Jan 2021", "https://fred.stlouisfed.org/series/SP500")
+if __name__ == "__main__":
+    with run_report("data_updater"):
+        main()
+        mirror()
@@ -0,0 +1,264 @@
+"""
+Derived metrics over the raw series: year-over-year change, trailing means,
+rebased indexes and rolling correlations, computed with NumPy so consumers
+never recompute them over the full history.
+
+Each bundle series (snapshot_to_json.BUNDLE_SERIES) gets a '<tab>_Derived' tab
+in the local series store (series_store.py), one row per observation date:
+
+  Date, yoy_pct, mean_30d, index_2021, corr_90d
+
+which the snapshot stage exports to docs/data like any other tab and the
+mirror stage pushes to Google Sheets. The metric set is configurable with
+DERIVED_METRICS (comma list, default below):
+
+  yoy_pct      % change against the value a year earlier (as-of, at most 31 days stale)
+  mean_<N>d    mean of the observations in the trailing N calendar days
+  index_<Y>    value rebased so the mean of year Y is 100
+  corr_<N>d    Pearson correlation with DERIVED_ANCHOR (as-of its dates) over N days
+
+Windows are calendar-based, so daily, weekly and monthly series are handled
+alike. Every metric at a date depends only on observations up to that date
+(and, for index_<Y>, on year Y), so after a run only the tail from the
+earliest new or revised observation is recomputed: the inputs and outputs of
+the previous run are cached in DERIVED_CACHE (.npz), compared as arrays, and
+only the changed rows are written back to the store.
+
+Run standalone with `python derived_metrics.py` (stores, then mirrors).
+"""
+
+import os
+import re
+from datetime import date
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from fileio import atomic_open
+from series_store import open_store
+from sheets_mirror import mirror
+from snapshot_to_json import BUNDLE_SERIES, bundle_points, derived_tab, published_records
+from telemetry import run_report, span
+
+DERIVED_METRICS = [m.strip() for m in os.getenv(
+    "DERIVED_METRICS", "yoy_pct,mean_30d,index_2021,corr_90d").split(",") if m.strip()]
+DERIVED_ANCHOR = os.getenv("DERIVED_ANCHOR", "S&P 500")
+DERIVED_CACHE = os.getenv("DERIVED_CACHE", "state/derived_cache.npz")
+DECIMALS = 6
+
+YOY_DAYS = 365
+YOY_MAX_STALE_DAYS = 31
+
+# (day ordinals, values) of one series
+Series = Tuple[np.ndarray, np.ndarray]
+
+
+class Metric:
+    """
+    A causal transform: `fn(days, values, ctx)` returns one output per input,
+    using only inputs within `lookback` days before each output date.
+    """
+
+    def __init__(self, name: str, fn: Callable, lookback: int, base_year: Optional[int] = None,
+                 uses_anchor: bool = False):
+        self.name = name
+        self.fn = fn
+        self.lookback = lookback
+        self.base_year = base_year
+        self.uses_anchor = uses_anchor
+
+
+def _window_sums(days: np.ndarray, cols: List[np.ndarray], window: int) -> List[np.ndarray]:
+    """Per position i, the sums of each column over observations in (days[i] - window, days[i]]."""
+    start = np.searchsorted(days, days - window, side="right")
+    end = np.arange(1, len(days) + 1)
+    out = []
+    for c in cols:
+        cs = np.concatenate(([0.0], np.cumsum(c)))
+        out.append(cs[end] - cs[start])
+    return out
+
+def yoy_pct(days: np.ndarray, values: np.ndarray, ctx: Dict) -> np.ndarray:
+    prev = np.searchsorted(days, days - YOY_DAYS, side="right") - 1
+    ok = prev >= 0
+    prev = np.where(ok, prev, 0)
+    ok &= (days - YOY_DAYS) - days[prev] <= YOY_MAX_STALE_DAYS
+    base = values[prev]
+    ok &= base != 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(ok, (values / base - 1.0) * 100.0, np.nan)
+
+def rolling_mean(window: int) -> Callable:
+    def fn(days: np.ndarray, values: np.ndarray, ctx: Dict) -> np.ndarray:
+        s, n = _window_sums(days, [values, np.ones_like(values)], window)
+        return s / n
+    return fn
+
+def rebased(year: int) -> Callable:
+    def fn(days: np.ndarray, values: np.ndarray, ctx: Dict) -> np.ndarray:
+        base = ctx.get("base", {}).get(year)
+        if base is None or base == 0:
+            return np.full(len(values), np.nan)
+        return values / base * 100.0
+    return fn
+
+def rolling_corr(window: int) -> Callable:
+    def fn(days: np.ndarray, values: np.ndarray, ctx: Dict) -> np.ndarray:
+        anchor = ctx.get("anchor")
+        if anchor is None or ctx.get("is_anchor"):
+            return np.full(len(values), np.nan)
+        a_days, a_values = anchor
+        j = np.searchsorted(a_days, days, side="right") - 1
+        ok = (j >= 0).astype(float)
+        y = np.where(j >= 0, a_values[np.maximum(j, 0)], 0.0)
+        x = values * ok
+        n, sx, sy, sxx, syy, sxy = _window_sums(days, [ok, x, y, x * x, y * y, x * y], window)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cov = sxy - sx * sy / n
+            den = np.sqrt((sxx - sx * sx / n) * (syy - sy * sy / n))
+            r = cov / den
+        return np.where((n >= 3) & (den > 0), np.clip(r, -1.0, 1.0), np.nan)
+    return fn
+
+def parse_metric(name: str) -> Metric:
+    if name == "yoy_pct":
+        return Metric(name, yoy_pct, YOY_DAYS + YOY_MAX_STALE_DAYS)
+    m = re.fullmatch(r"mean_(\d+)d", name)
+    if m:
+        return Metric(name, rolling_mean(int(m.group(1))), int(m.group(1)))
+    m = re.fullmatch(r"index_(\d{4})", name)
+    if m:
+        return Metric(name, rebased(int(m.group(1))), 0, base_year=int(m.group(1)))
+    m = re.fullmatch(r"corr_(\d+)d", name)
+    if m:
+        return Metric(name, rolling_corr(int(m.group(1))), int(m.group(1)), uses_anchor=True)
+    raise ValueError(f"Unknown derived metric: {name}")
+
+def compute(metrics: List[Metric], series: Series, ctx: Dict, start: int = 0) -> np.ndarray:
+    """
+    Outputs (rows x metrics) for positions start.. of `series`, computed from
+    the inputs within the metrics' lookback of days[start] only.
+    """
+    days, values = series
+    if start >= len(days):
+        return np.empty((0, len(metrics)))
+    lookback = max([m.lookback for m in metrics] + [0])
+    lo = max(0, int(np.searchsorted(days, days[start] - lookback, side="left")) - 1)
+    cols = [m.fn(days[lo:], values[lo:], ctx)[start - lo:] for m in metrics]
+    return np.round(np.column_stack(cols), DECIMALS)
+
+def first_change(old: Optional[Series], new: Series) -> Optional[int]:
+    """Index of the first observation that differs between two runs, None if identical."""
+    if old is None:
+        return 0
+    n = min(len(old[0]), len(new[0]))
+    diff = np.flatnonzero((old[0][:n] != new[0][:n]) | (old[1][:n] != new[1][:n]))
+    if diff.size:
+        return int(diff[0])
+    return None if len(old[0]) == len(new[0]) else n
+
+def appended_only(old: Series, new: Series) -> bool:
+    """True if `new` keeps every date of `old` (values may be revised) and only adds later ones."""
+    n = len(old[0])
+    return len(new[0]) >= n and bool(np.array_equal(old[0], new[0][:n]))
+
+def base_values(series: Series, years: List[int]) -> Dict[int, Optional[float]]:
+    days, values = series
+    out = {}
+    for y in years:
+        lo, hi = np.searchsorted(days, [date(y, 1, 1).toordinal(), date(y + 1, 1, 1).toordinal()])
+        out[y] = float(values[lo:hi].mean()) if hi > lo else None
+    return out
+
+def load_series(tab: str, keys: List[str]) -> Series:
+    points = bundle_points(published_records(tab), keys)
+    days = np.array([date.fromisoformat(d).toordinal() for d, _ in points], dtype=np.int64)
+    values = np.array([v for _, v in points], dtype=float)
+    return days, values
+
+def load_cache(path: str, metrics: List[str]) -> Dict[str, Tuple[Series, np.ndarray]]:
+    """{label: ((days, values), outputs)} from the last run; empty if the metric set changed."""
+    if not os.path.exists(path):
+        return {}
+    with np.load(path, allow_pickle=False) as z:
+        if list(z["metrics"]) != metrics:
+            return {}
+        return {str(label): ((z[f"days_{i}"], z[f"values_{i}"]), z[f"out_{i}"])
+                for i, label in enumerate(z["labels"])}
+
+def save_cache(path: str, metrics: List[str], cache: Dict[str, Tuple[Series, np.ndarray]]):
+    arrays = {"metrics": np.array(metrics), "labels": np.array(list(cache))}
+    for i, ((days, values), out) in enumerate(cache.values()):
+        arrays.update({f"days_{i}": days, f"values_{i}": values, f"out_{i}": out})
+    with atomic_open(path) as f:
+        np.savez_compressed(f, **arrays)
+
+def to_rows(days: np.ndarray, out: np.ndarray) -> List[List]:
+    iso = [date.fromordinal(int(d)).isoformat() for d in days]
+    return [[d] + [None if np.isnan(x) else float(x) for x in row] for d, row in zip(iso, out.tolist())]
+
+def main() -> List[str]:
+    """Recompute the derived tabs' changed tails; returns the names of tabs that changed."""
+    metrics = [parse_metric(m) for m in DERIVED_METRICS]
+    names = [m.name for m in metrics]
+    years = sorted({m.base_year for m in metrics if m.base_year is not None})
+    store = open_store()
+    cache = load_cache(DERIVED_CACHE, names)
+
+    with span("store_read", tabs=len(BUNDLE_SERIES)):
+        inputs = {label: load_series(tab, keys) for label, (tab, keys) in BUNDLE_SERIES.items()}
+    anchor = inputs.get(DERIVED_ANCHOR)
+    anchor_change = first_change(cache.get(DERIVED_ANCHOR, (None,))[0], anchor) if anchor is not None else None
+
+    changed = []
+    recomputed = False
+    new_cache = {}
+    for label, (tab, _) in BUNDLE_SERIES.items():
+        series = inputs[label]
+        days = series[0]
+        if not len(days):
+            continue
+        old, old_out = cache.get(label, (None, None))
+        start = first_change(old, series)
+        if anchor_change is not None and any(m.uses_anchor for m in metrics) and label != DERIVED_ANCHOR:
+            at = int(np.searchsorted(days, anchor[0][anchor_change])) if anchor_change < len(anchor[0]) else len(days)
+            start = at if start is None else min(start, at)
+        base = base_values(series, years)
+        if start is not None and years and old is not None and base != base_values(old, years):
+            start = 0
+        out_tab = derived_tab(tab)
+        rewrite = old is None or not store.has(out_tab) or not appended_only(old, series)
+        if start is None and not rewrite:
+            new_cache[label] = (series, old_out)
+            continue
+        start = 0 if rewrite else start
+
+        ctx = {"anchor": anchor, "is_anchor": label == DERIVED_ANCHOR, "base": base}
+        with span("derive", tab=out_tab, rows=len(days) - start):
+            tail = compute(metrics, series, ctx, start)
+        out = np.vstack([old_out[:start], tail]) if start else tail
+        new_cache[label] = (series, out)
+        recomputed = True
+
+        header = ["Date"] + names
+        if rewrite:
+            # Dates were removed or the cache is gone: the stored rows can't be patched
+            store.replace(out_tab, header, to_rows(days, out))
+            updated, inserted = 0, len(out)
+        else:
+            updated, inserted = store.upsert(out_tab, header, to_rows(days[start:], tail))
+        if updated or inserted:
+            print(f"✅ {out_tab}: {updated} revised, {inserted} new rows")
+            changed.append(out_tab)
+        else:
+            print(f"✅ {out_tab}: unchanged")
+
+    # An unchanged run leaves the cache file (and its commit) alone
+    if recomputed or list(new_cache) != list(cache):
+        save_cache(DERIVED_CACHE, names, new_cache)
+    return changed
+
+if __name__ == "__main__":
+    with run_report("derived_metrics"):
+        main()
+        mirror()
@@ -12,16 +12,24 @@ const SERIES = {
   "10Y Treasury (%)": { file: "Interest_Rates.json", valueKeys: ["10-Year Treasury Rate (%)","Rate (%)"] },
   "S&P 500": { file: "Stock_Market.json", valueKeys: ["S&P 500 Index","Close"] }
 };
-const POLICY_FILE = "Policy_Events.json";
+const POLICY_FILE = "Policy_Events.json";           // legacy single-file output
+const POLICY_DIR = "Policy_Events/";                // date partitions + manifest.json (partitions.py)
+const SEARCH_FILE = "Policy_Events.search.json";    // inverted index + facets (search_index.py)
+// Pre-merged, date-aligned daily/weekly/monthly matrix written by snapshot_to_json.py
+const BUNDLE_FILE = "series_bundle.json";
+const RESOLUTIONS = ["daily", "weekly", "monthly"];
+const RESOLUTION_STEP_DAYS = { daily: 1, weekly: 7, monthly: 30 };
 
 // Performance knobs
 const MAX_EVENT_MARKERS = 120;   // cap vertical policy lines
 const MAX_VISIBLE_POINTS = 1500; // decimation target per dataset
 
 // state
-let rawSeries = {};
+let bundle = null;   // { series, resolutions: { daily|weekly|monthly: { dates, values } } }
 let mergedDates = [];
 let policyEvents = [];
+let policyManifest = null;          // null: events come from POLICY_FILE
+const policyPartitions = new Map(); // partition file -> events (or a pending Promise)
 let selected = new Set(Object.keys(SERIES));
 let percentMode = false;
 let zscoreMode = false;
@@ -32,6 +40,9 @@ let currentLag = 0;
 let dateRange = { start: null, end: null };
 let typeFilter = new Set();
 let agencyFilterText = "";
+let keywordFilterText = "";
+let searchIndex = null;   // null: not loaded yet; false: not published
+let searchMatches = null; // Set of document ids matching the agency/keyword filters
 
 // utility
 const toNum = (x) => (x === null || x === undefined || x === "" ? null : Number(x));
@@ -96,39 +107,178 @@ async function fetchJSON(rel) {
   return res.json();
 }
 
-async function loadAll() {
-  for (const [name, cfg] of Object.entries(SERIES)) {
-    const arr = await fetchJSON(cfg.file);
-    const points = [];
-    for (const row of arr) {
-      const date = row.Date;
+// Columnar snapshots (<tab>.col.json, see columnar.py) are much smaller than the
+// record arrays; fall back to the plain JSON file when one isn't published.
+function decodeColumn(enc) {
+  if (enc.enc === "plain") return enc.values;
+  const out = [];
+  if (enc.enc === "rle") {
+    enc.values.forEach((v, i) => { for (let k = 0; k < enc.runs[i]; k++) out.push(v); });
+    return out;
+  }
+  if (enc.enc === "date-delta") {
+    const day = 86400000;
+    let t = Date.parse(enc.start + "T00:00:00Z");
+    out.push(enc.start);
+    enc.values.forEach((d, i) => {
+      for (let k = 0; k < enc.runs[i]; k++) { t += d * day; out.push(new Date(t).toISOString().slice(0, 10)); }
+    });
+    return out;
+  }
+  throw new Error(`Unknown column encoding: ${enc.enc}`);
+}
+
+function decodeColumnar(doc) {
+  const cols = {};
+  for (const c of doc.columns) cols[c] = decodeColumn(doc.data[c]);
+  const rows = new Array(doc.rows);
+  for (let i = 0; i < doc.rows; i++) {
+    const row = {};
+    for (const c of doc.columns) row[c] = cols[c][i];
+    rows[i] = row;
+  }
+  return rows;
+}
+
+async function fetchRecords(file) {
+  try {
+    return decodeColumnar(await fetchJSON(file.replace(/\.json$/, ".col.json")));
+  } catch (err) {
+    return fetchJSON(file);
+  }
+}
+
+// Fallback when no bundle is published: merge the per-series files into the
+// bundle's shape (daily resolution only).
+async function loadBundleFromFiles() {
+  const perSeries = {};
+  await Promise.all(Object.entries(SERIES).map(async ([name, cfg]) => {
+    const map = new Map();
+    for (const row of await fetchRecords(cfg.file)) {
       let val = null;
       for (const key of cfg.valueKeys) {
         if (row[key] !== undefined) { val = toNum(row[key]); break; }
       }
-      if (date) points.push({ date, value: val });
+      if (row.Date) map.set(row.Date, val);
     }
-    points.sort((a,b)=> new Date(a.date) - new Date(b.date));
-    rawSeries[name] = points;
+    perSeries[name] = map;
+  }));
+  const dates = uniq(Object.values(perSeries).flatMap(m => Array.from(m.keys()))).sort();
+  const values = {};
+  for (const name of Object.keys(SERIES)) {
+    values[name] = dates.map(d => (perSeries[name].has(d) ? perSeries[name].get(d) : null));
   }
+  return { series: Object.keys(SERIES), resolutions: { daily: { dates, values } } };
+}
 
-  mergedDates = uniq(
-    Object.values(rawSeries).flatMap(s => s.map(p => p.date))
-  ).sort((a,b)=> new Date(a) - new Date(b));
+// Same key as policy_store.record_key(): the FR document number in the URL.
+function eventId(e, url) {
+  const m = /\/documents\/\d{4}\/\d{2}\/\d{2}\/([^/?#]+)/.exec(url);
+  return m ? m[1] : `${e.Date || ""}|${e.Title || ""}`;
+}
 
-  const events = await fetchJSON(POLICY_FILE);
-  policyEvents = events.map(e => ({
+function toEvent(e) {
+  const url = e["Source URL"] || e.Source || "";
+  return {
+    id: eventId(e, url),
     date: e.Date,
     title: e.Title || e.Type,
     type: e.Type || "",
     agency: e.Agency || "",
-    url: e["Source URL"] || e.Source || ""
-  })).filter(e => e.date);
+    url
+  };
+}
+
+// ---------- Search index ----------
+// Posting lists are ascending document positions stored as gaps.
+function undelta(gaps) {
+  let p = 0;
+  return gaps.map(g => (p += g));
+}
+
+function intersectSorted(a, b) {
+  const out = [];
+  let i = 0, j = 0;
+  while (i < a.length && j < b.length) {
+    if (a[i] < b[j]) i++;
+    else if (a[i] > b[j]) j++;
+    else { out.push(a[i]); i++; j++; }
+  }
+  return out;
+}
+
+async function loadSearchIndex() {
+  if (searchIndex === null) searchIndex = await fetchJSON(SEARCH_FILE).catch(() => false);
+  return searchIndex;
+}
+
+// Document ids matching the agency/keyword filters, looked up in the index
+// instead of scanning events (which cover only the loaded partitions anyway).
+function searchIds(idx, agencyText, keywordText) {
+  let hits = null;
+  if (agencyText) {
+    const positions = new Set();
+    for (const [name, f] of Object.entries(idx.facets.agency)) {
+      if (name.toLowerCase().includes(agencyText)) undelta(f.docs).forEach(p => positions.add(p));
+    }
+    hits = Array.from(positions).sort((a, b) => a - b);
+  }
+  const stop = new Set(idx.stopwords);
+  const terms = uniq((keywordText.match(/[a-z0-9]+/g) || []).filter(t => t.length > 1 && !stop.has(t)));
+  for (const t of terms) {
+    const docs = idx.terms[t] ? undelta(idx.terms[t]) : [];
+    hits = hits ? intersectSorted(hits, docs) : docs;
+  }
+  return hits && new Set(hits.map(p => idx.docs.id[p]));
+}
+
+// Fetch the policy partitions overlapping [start, end] that aren't loaded yet.
+// Partitions are kept in manifest (date) order, so nothing is sorted here.
+async function ensurePolicyRange(start, end) {
+  if (!policyManifest) return;
+  const wanted = policyManifest.partitions.filter(p =>
+    !p.start || ((!end || p.start <= end) && (!start || p.end >= start)));
+  const missing = wanted.filter(p => !policyPartitions.has(p.file));
+  if (!missing.length) return;
+  await Promise.all(missing.map(p => {
+    const pending = fetchJSON(POLICY_DIR + p.file).then(rows => {
+      policyPartitions.set(p.file, rows.map(toEvent).filter(e => e.date));
+    });
+    policyPartitions.set(p.file, pending);
+    return pending;
+  }));
+  policyEvents = policyManifest.partitions
+    .map(p => policyPartitions.get(p.file))
+    .filter(evs => Array.isArray(evs))
+    .flat();
+  refreshTypeOptions();
+}
+
+async function loadAll() {
+  const [loaded, manifest] = await Promise.all([
+    fetchJSON(BUNDLE_FILE).catch(() => loadBundleFromFiles()),
+    fetchJSON(POLICY_DIR + "manifest.json").catch(() => null)
+  ]);
+  bundle = loaded;
+  mergedDates = bundle.resolutions.daily.dates;
+  policyManifest = manifest;
 
   initUI();
+  if (policyManifest) {
+    await ensurePolicyRange(dateRange.start, dateRange.end);
+  } else {
+    policyEvents = (await fetchRecords(POLICY_FILE)).map(toEvent).filter(e => e.date);
+    refreshTypeOptions();
+  }
   renderAll();
 }
 
+function refreshTypeOptions() {
+  const typeSel = document.getElementById("typeFilter");
+  const types = uniq(policyEvents.map(e=>e.type)).sort();
+  typeSel.innerHTML = types.map(t => `<option value="${t}"${typeFilter.has(t) ? " selected" : ""}>${t}</option>`).join("");
+}
+
 function initUI() {
   const chips = document.getElementById("seriesChips");
   chips.innerHTML = "";
@@ -155,16 +305,19 @@ function initUI() {
   document.getElementById("applyRange").onclick = () => {
     dateRange.start = sd.value || null;
     dateRange.end = ed.value || null;
-    scheduleRender();
+    ensurePolicyRange(dateRange.start, dateRange.end).then(scheduleRender);
   };
 
   const typeSel = document.getElementById("typeFilter");
-  const types = uniq(policyEvents.map(e=>e.type)).sort();
-  typeSel.innerHTML = types.map(t => `<option value="${t}">${t}</option>`).join("");
   document.getElementById("applyEventFilters").onclick = () => {
     typeFilter = new Set(Array.from(typeSel.selectedOptions).map(o=>o.value));
     agencyFilterText = (document.getElementById("agencyFilter").value || "").toLowerCase();
-    scheduleRender();
+    keywordFilterText = (document.getElementById("keywordFilter").value || "").toLowerCase();
+    const needIndex = agencyFilterText || keywordFilterText;
+    (needIndex ? loadSearchIndex() : Promise.resolve(false)).then(idx => {
+      searchMatches = idx ? searchIds(idx, agencyFilterText, keywordFilterText) : null;
+      scheduleRender();
+    });
   };
 
   const wrap = document.getElementById("anchorSelectWrap");
@@ -195,16 +348,34 @@ function toggleSelection(name) {
   scheduleRender();
 }
 
+// first index i with arr[i] > x (strict) or >= x
+function bisect(arr, x, strict) {
+  let lo = 0, hi = arr.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >> 1;
+    if (strict ? arr[mid] <= x : arr[mid] < x) lo = mid + 1; else hi = mid;
+  }
+  return lo;
+}
+
+// Finest resolution that fits the date range in MAX_VISIBLE_POINTS columns
+function pickResolution() {
+  const available = RESOLUTIONS.filter(r => bundle.resolutions[r]);
+  for (const name of available) {
+    const dates = bundle.resolutions[name].dates;
+    const i = dateRange.start ? bisect(dates, dateRange.start, false) : 0;
+    const j = dateRange.end ? bisect(dates, dateRange.end, true) : dates.length;
+    if (j - i <= MAX_VISIBLE_POINTS || name === available[available.length - 1]) {
+      return { name, res: bundle.resolutions[name], i, j };
+    }
+  }
+}
+
 function buildFrame() {
-  const dates = mergedDates.filter(d => {
-    if (dateRange.start && d < dateRange.start) return false;
-    if (dateRange.end && d > dateRange.end) return false;
-    return true;
-  });
-  const frame = { dates, series: {} };
+  const { name: resolution, res, i, j } = pickResolution();
+  const frame = { dates: res.dates.slice(i, j), series: {}, step: RESOLUTION_STEP_DAYS[resolution] };
   for (const name of Object.keys(SERIES)) {
-    const map = new Map(rawSeries[name].map(p => [p.date, p.value]));
-    frame.series[name] = dates.map(d => (map.has(d) ? map.get(d) : null));
+    frame.series[name] = res.values[name] ? res.values[name].slice(i, j) : frame.dates.map(() => null);
     if (smoothMode) frame.series[name] = rollingAverage(frame.series[name], smoothN);
   }
   if (percentMode) {
@@ -249,7 +420,7 @@ function renderChart(frame, filteredEvents) {
 
   const datasets = visibleSeries.map((name, i) => ({
     label: name,
-    data: (name === anchor ? shift(frame.series[name], currentLag) : frame.series[name]),
+    data: (name === anchor ? shift(frame.series[name], currentLag / frame.step) : frame.series[name]),
     borderColor: palette[i % palette.length],
     backgroundColor: "transparent",
     borderWidth: 2,
@@ -349,7 +520,7 @@ function renderCorrelation(frame) {
   const vis = Array.from(selected);
   if (!vis.includes(anchor)) vis.unshift(anchor);
 
-  const anchorVals = shift(frame.series[anchor], currentLag);
+  const anchorVals = shift(frame.series[anchor], currentLag / frame.step);
   for (const name of vis) {
     if (name === anchor) continue;
     const { r, n } = pearson(anchorVals, frame.series[name]);
@@ -364,7 +535,9 @@ function filterEvents() {
     if (dateRange.start && ev.date < dateRange.start) return false;
     if (dateRange.end && ev.date > dateRange.end) return false;
     if (typeFilter.size && !typeFilter.has(ev.type)) return false;
+    if (searchMatches) return searchMatches.has(ev.id);
     if (agencyFilterText && !ev.agency.toLowerCase().includes(agencyFilterText)) return false;
+    if (keywordFilterText && !ev.title.toLowerCase().includes(keywordFilterText)) return false;
     return true;
   });
 }
@@ -0,0 +1,88 @@
+"""
+Shape-preserving downsampling (Largest-Triangle-Three-Buckets) and the
+date-aligned multi-resolution bundle the dashboard loads.
+
+LTTB keeps, per bucket, the point forming the largest triangle with the point
+kept in the previous bucket and the average of the next bucket, so peaks and
+troughs survive where a plain mean or last-value resample would flatten them.
+For the bundle the buckets are calendar periods (ISO week, month), so every
+series shares one date axis per resolution and the browser never merges or
+sorts anything:
+
+  {"format": "series-bundle", "version": 1, "generated": "...",
+   "series": [label, ...],
+   "resolutions": {"daily":   {"dates": [...], "values": {label: [...]}},
+                   "weekly":  {...},   # one column per ISO week (its Monday)
+                   "monthly": {...}}}  # one column per month (its 1st)
+
+Missing values are null.
+"""
+
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+FORMAT = "series-bundle"
+VERSION = 1
+
+Point = Tuple[float, float]
+
+# resolution -> date -> bucket start date
+RESOLUTIONS: Dict[str, Callable[[date], date]] = {
+    "daily": lambda d: d,
+    "weekly": lambda d: d - timedelta(days=d.weekday()),
+    "monthly": lambda d: d.replace(day=1),
+}
+
+
+def _area(a: Point, b: Point, c: Point) -> float:
+    return abs((a[0] - c[0]) * (b[1] - a[1]) - (a[0] - b[0]) * (c[1] - a[1]))
+
+def lttb_buckets(points: Sequence[Point], buckets: Sequence[Sequence[int]]) -> List[int]:
+    """
+    One index per non-empty bucket (buckets are ascending runs of indexes into
+    `points`). The first and last buckets keep their first and last point.
+    """
+    buckets = [b for b in buckets if b]
+    if len(buckets) <= 2:
+        return [b[0] if i == 0 else b[-1] for i, b in enumerate(buckets)]
+    picked = [buckets[0][0]]
+    for i in range(1, len(buckets) - 1):
+        a = points[picked[-1]]
+        nxt = buckets[i + 1]
+        avg = (sum(points[j][0] for j in nxt) / len(nxt), sum(points[j][1] for j in nxt) / len(nxt))
+        picked.append(max(buckets[i], key=lambda j: _area(a, points[j], avg)))
+    picked.append(buckets[-1][-1])
+    return picked
+
+def resample(series: Sequence[Tuple[str, float]], resolution: str) -> Dict[str, float]:
+    """
+    {bucket start date: value} for a date-sorted [(YYYY-MM-DD, value)] series,
+    one LTTB-selected point per calendar bucket of `resolution`.
+    """
+    parsed = [(date.fromisoformat(d), v) for d, v in series]
+    if resolution == "daily" or not parsed:
+        return {d.isoformat(): v for d, v in parsed}
+    key = RESOLUTIONS[resolution]
+    points = [(float(d.toordinal()), float(v)) for d, v in parsed]
+    buckets: List[List[int]] = []
+    last: Optional[date] = None
+    for i, (d, _) in enumerate(parsed):
+        k = key(d)
+        if k != last:
+            buckets.append([])
+            last = k
+        buckets[-1].append(i)
+    return {key(parsed[i][0]).isoformat(): parsed[i][1] for i in lttb_buckets(points, buckets)}
+
+def build_bundle(series: Dict[str, Sequence[Tuple[str, float]]], generated: str) -> Dict:
+    """Date-aligned bundle for {label: [(date, value), ...]} (values numeric, dates sorted)."""
+    out = {"format": FORMAT, "version": VERSION, "generated": generated,
+           "series": list(series), "resolutions": {}}
+    for res in RESOLUTIONS:
+        columns = {label: resample(points, res) for label, points in series.items()}
+        dates = sorted({d for col in columns.values() for d in col})
+        out["resolutions"][res] = {
+            "dates": dates,
+            "values": {label: [col.get(d) for d in dates] for label, col in columns.items()},
+        }
+    return out
@@ -0,0 +1,175 @@
+"""
+Policy event -> market reaction join.
+
+For every policy event (policy_store.py) and every bundle series
+(snapshot_to_json.BUNDLE_SERIES) this precomputes the series' as-of value on
+the publication date and its change over the N days before and after it, so
+the dashboard and any analysis read one table instead of scanning each
+series per event. Lookups are merge-asof style: the series' sorted date
+array is searched for all events at once (numpy.searchsorted), so a run costs
+O(events x log observations) per series.
+
+Output (REACTIONS_OUT, default docs/data/Policy_Reactions.json) is columnar:
+
+  {"format": "event-reactions", "version": 1, "generated": "...",
+   "windows": [7, 30], "settled_before": "2025-08-01",
+   "events": {"id": [document_number, ...], "date": [...]},
+   "series": {label: {"unit": "pct" | "diff",
+                      "asof": [...], "pre_7d": [...], "post_7d": [...], ...}}}
+
+pre_Nd is the change from the as-of value N days before the event to the
+event date, post_Nd from the event date to N days after. Changes are in % or,
+for series quoted in percent (units "Percent" in series_registry.py), in
+percentage points.
+Missing values are null: no observation within REACTION_MAX_STALE_DAYS of the
+date, or the post window hasn't elapsed yet.
+
+Rows are updated incrementally: rows of events dated before 'settled_before'
+(the earliest series end minus the longest window and the FRED revision
+lookback) are kept from the previous file, so a run only computes new events
+and the recent ones whose windows may still fill in or be revised. The file
+is only rewritten when a row changed, not for a new 'generated' stamp alone.
+
+Run standalone with `python event_reactions.py`.
+"""
+
+import json
+import os
+from datetime import date, datetime
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from derived_metrics import load_series
+from fileio import write_atomic
+from policy_store import PolicyStore
+from series_registry import SERIES
+from snapshot_to_json import BUNDLE_SERIES
+from telemetry import run_report, span
+
+FORMAT = "event-reactions"
+VERSION = 1
+
+REACTIONS_OUT = os.getenv("REACTIONS_OUT", "docs/data/Policy_Reactions.json")
+REACTION_WINDOWS = sorted({int(n) for n in os.getenv("REACTION_WINDOWS", "7,30").split(",") if n.strip()})
+REACTION_MAX_STALE_DAYS = int(os.getenv("REACTION_MAX_STALE_DAYS", "31"))
+# Settled rows are recomputed anyway for this many days, to pick up FRED revisions
+REACTION_REFRESH_DAYS = int(os.getenv("REACTION_REFRESH_DAYS", os.getenv("REVISION_LOOKBACK_DAYS", "60")))
+# Series quoted in percent react in percentage points, not % change
+REACTION_DIFF_SERIES = {s["label"] for s in SERIES if s.get("label") and s["units"] == "Percent"}
+POLICY_STORE = os.getenv("POLICY_STORE", "state/policy_store.db")
+DECIMALS = 6
+
+
+def columns() -> List[str]:
+    return ["asof"] + [f"{side}_{n}d" for n in REACTION_WINDOWS for side in ("pre", "post")]
+
+def asof(days: np.ndarray, values: np.ndarray, at: np.ndarray) -> np.ndarray:
+    """Value of the last observation on or before each of `at` (NaN if none or stale)."""
+    if not len(days):
+        return np.full(len(at), np.nan)
+    j = np.searchsorted(days, at, side="right") - 1
+    ok = j >= 0
+    j = np.maximum(j, 0)
+    ok &= at - days[j] <= REACTION_MAX_STALE_DAYS
+    return np.where(ok, values[j], np.nan)
+
+def change(a: np.ndarray, b: np.ndarray, diff: bool) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return b - a if diff else np.where(a != 0, (b / a - 1.0) * 100.0, np.nan)
+
+def reactions(series: Tuple[np.ndarray, np.ndarray], event_days: np.ndarray, diff: bool) -> Dict[str, np.ndarray]:
+    """{column: values per event} for one series."""
+    days, values = series
+    at = asof(days, values, event_days)
+    out = {"asof": at}
+    last = days[-1] if len(days) else -1
+    for n in REACTION_WINDOWS:
+        before = asof(days, values, event_days - n)
+        after = asof(days, values, event_days + n)
+        after = np.where(event_days + n <= last, after, np.nan)
+        out[f"pre_{n}d"] = change(before, at, diff)
+        out[f"post_{n}d"] = change(at, after, diff)
+    return {k: np.round(v, DECIMALS) for k, v in out.items()}
+
+def _json_column(values: np.ndarray) -> List:
+    return [None if np.isnan(x) else x for x in values.tolist()]
+
+def load_table(path: str) -> Dict:
+    """The previous output if it was built with the same windows and series, else {}."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        table = json.load(f)
+    if table.get("format") != FORMAT or table.get("windows") != REACTION_WINDOWS \
+            or list(table.get("series", {})) != list(BUNDLE_SERIES):
+        return {}
+    return table
+
+def main() -> int:
+    """Rebuild the reactions table; returns the number of event rows computed this run."""
+    if not os.path.exists(POLICY_STORE):
+        print(f"✅ No policy store at {POLICY_STORE}; skipping reactions")
+        return 0
+    store = PolicyStore(POLICY_STORE, read_only=True)
+    try:
+        with span("store_read", tab="Policy_Events"):
+            events = store.events()
+    finally:
+        store.close()
+    with span("store_read", tabs=len(BUNDLE_SERIES)):
+        series = {label: load_series(tab, keys) for label, (tab, keys) in BUNDLE_SERIES.items()}
+
+    ends = [s[0][-1] for s in series.values() if len(s[0])]
+    horizon = max(REACTION_WINDOWS + [0]) + REACTION_REFRESH_DAYS
+    settled = date.fromordinal(int(min(ends)) - horizon).isoformat() if ends else ""
+
+    old = load_table(REACTIONS_OUT)
+    old_row = {}
+    if old and settled:
+        old_row = {(k, d): i for i, (k, d) in enumerate(zip(old["events"]["id"], old["events"]["date"]))
+                   if d < settled}
+
+    ids = [k for k, _ in events]
+    dates = [d for _, d in events]
+    # A corrected publication date makes the event new
+    kept = [(i, old_row[e]) for i, e in enumerate(events) if e in old_row]
+    todo = [i for i, e in enumerate(events) if e not in old_row]
+    todo_days = np.array([date.fromisoformat(dates[i][:10]).toordinal() for i in todo], dtype=np.int64)
+
+    out = {}
+    with span("join", events=len(todo), series=len(series)):
+        for label, s in series.items():
+            fresh = reactions(s, todo_days, label in REACTION_DIFF_SERIES)
+            cols = {}
+            for c in columns():
+                col = [None] * len(ids)
+                if kept:
+                    prev = old["series"][label][c]
+                    for i, j in kept:
+                        col[i] = prev[j]
+                for i, v in zip(todo, _json_column(fresh[c])):
+                    col[i] = v
+                cols[c] = col
+            out[label] = dict(unit="diff" if label in REACTION_DIFF_SERIES else "pct", **cols)
+
+    table = {
+        "format": FORMAT,
+        "version": VERSION,
+        "generated": datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "windows": REACTION_WINDOWS,
+        "settled_before": settled,
+        "events": {"id": ids, "date": dates},
+        "series": out,
+    }
+    if old and dict(old, generated=None) == dict(table, generated=None):
+        print(f"✅ Reactions for {len(ids)} events unchanged ({len(todo)} computed)")
+        return len(todo)
+    with span("json_write", path=REACTIONS_OUT):
+        write_atomic(REACTIONS_OUT, json.dumps(table, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+    print(f"✅ Exported reactions for {len(ids)} events ({len(todo)} computed) to {REACTIONS_OUT}")
+    return len(todo)
+
+if __name__ == "__main__":
+    with run_report("event_reactions"):
+        main()
@@ -0,0 +1,92 @@
+"""
+Bounded-memory sorting of large record streams.
+
+Records are buffered up to a fixed number of rows, sorted, and spilled to
+NDJSON "run" files; merge_runs() then streams all runs back in global order
+with heapq.merge, holding one record per run in memory. dedup_sorted() drops
+repeated records from a sorted stream while remembering only the keys of the
+current sort group.
+
+Used by policy_tracker's streaming mode (POLICY_STREAM=1) for backfills whose
+size would otherwise be bounded only by RAM.
+"""
+
+import heapq
+import json
+import os
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from fileio import atomic_open
+
+Record = Dict
+KeyFn = Callable[[Record], object]
+
+
+def write_ndjson(records: Iterable[Record], path: str) -> int:
+    """Write one compact JSON object per line; returns the number of records."""
+    n = 0
+    with atomic_open(path, "w", encoding="utf-8") as f:
+        for r in records:
+            f.write(json.dumps(r, ensure_ascii=False, separators=(",", ":")))
+            f.write("\n")
+            n += 1
+    return n
+
+def read_ndjson(path: str) -> Iterator[Record]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class RunWriter:
+    """
+    Collects records and spills them as sorted runs of at most `run_rows` rows.
+    Run files are named <prefix>-<n>.ndjson inside `directory`.
+    """
+
+    def __init__(self, directory: str, key: KeyFn, run_rows: int = 5000, prefix: str = "run"):
+        self.directory = directory
+        self.key = key
+        self.run_rows = max(1, run_rows)
+        self.prefix = prefix
+        self.paths: List[str] = []
+        self._buf: List[Record] = []
+
+    def add(self, record: Record):
+        self._buf.append(record)
+        if len(self._buf) >= self.run_rows:
+            self.flush()
+
+    def flush(self):
+        if not self._buf:
+            return
+        self._buf.sort(key=self.key)
+        path = os.path.join(self.directory, f"{self.prefix}-{len(self.paths):05d}.ndjson")
+        write_ndjson(self._buf, path)
+        self.paths.append(path)
+        self._buf = []
+
+
+def merge_runs(paths: Iterable[str], key: KeyFn) -> Iterator[Record]:
+    """Stream the records of sorted run files in global `key` order."""
+    return heapq.merge(*(read_ndjson(p) for p in paths), key=key)
+
+def dedup_sorted(records: Iterable[Record], ident: KeyFn, group: KeyFn) -> Iterator[Record]:
+    """
+    Yield the first record per `ident` from a stream sorted so that duplicates
+    share a `group` value (e.g. the publication date); only the current
+    group's identities are kept in memory.
+    """
+    current: Optional[object] = object()
+    seen = set()
+    for r in records:
+        g = group(r)
+        if g != current:
+            current = g
+            seen = set()
+        k = ident(r)
+        if k in seen:
+            continue
+        seen.add(k)
+        yield r
@@ -0,0 +1,53 @@
+"""
+Atomic, change-aware file output for docs/data and state.
+
+Files are written to a temporary sibling and renamed into place, so readers
+(and a workflow committing mid-run) never see a partial file. write_if_changed()
+leaves a file alone when its bytes would not change, so timestamps stay put
+and `git add` only ever sees real changes.
+"""
+
+import os
+import stat
+import tempfile
+from contextlib import contextmanager
+from typing import IO, Iterator
+
+
+@contextmanager
+def atomic_open(path: str, mode: str = "wb", **kwargs) -> Iterator[IO]:
+    """Open a temporary sibling of `path` for streaming writes; it replaces `path` on success."""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    # A unique name per writer, so concurrent writes of one path don't share it
+    fd, tmp = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+    try:
+        # mkstemp creates the file private (0600); give it the usual mode
+        os.chmod(tmp, stat.S_IMODE(os.stat(path).st_mode) if os.path.exists(path) else 0o644)
+        with open(fd, mode, **kwargs) as f:
+            yield f
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    os.replace(tmp, path)
+
+def write_atomic(path: str, data: bytes):
+    with atomic_open(path) as f:
+        f.write(data)
+
+def same_content(path: str, data: bytes) -> bool:
+    try:
+        if os.path.getsize(path) != len(data):
+            return False
+        with open(path, "rb") as f:
+            return f.read() == data
+    except OSError:
+        return False
+
+def write_if_changed(path: str, data: bytes) -> bool:
+    """Atomically write `data` unless `path` already holds it; returns True if written."""
+    if same_content(path, data):
+        return False
+    write_atomic(path, data)
+    return True
@@ -0,0 +1,85 @@
+"""
+FRED observations client: fetches any number of series concurrently over one
+pooled keep-alive Session (see http_session.build_session).
+
+- Concurrency is capped by max_workers to stay well inside FRED's rate limit
+  (120 requests/minute per API key).
+- Each series gets its own timeout (default or per-series override).
+- Failures are isolated: a slow or broken series is reported in `errors`
+  and never blocks or aborts the others.
+"""
+
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import requests
+
+from telemetry import span
+
+log = logging.getLogger("fred-client")
+
+FRED_BASE_URL = os.getenv("FRED_BASE_URL", "https://api.stlouisfed.org/fred/series/observations")
+
+Rows = List[list]
+
+
+def parse_observations(observations: List[Dict]) -> Rows:
+    """
+    Convert FRED observations into sorted [date, value] rows, dropping missing values ('.').
+    """
+    rows = [[obs["date"], float(obs["value"])] for obs in observations if obs.get("value") not in (".", "", None)]
+    rows.sort(key=lambda x: x[0])
+    return rows
+
+def fetch_series(session: requests.Session, series_id: str, api_key: str, start: str,
+                 end: Optional[str] = None, timeout: Optional[int] = None) -> Rows:
+    """
+    Fetch one series' observations in [start..end] as sorted [date, value] rows.
+    """
+    params = {
+        "series_id": series_id,
+        "observation_start": start,
+        "api_key": api_key,
+        "file_type": "json",
+    }
+    if end:
+        params["observation_end"] = end
+    kwargs = {"timeout": timeout} if timeout else {}
+    with span("fetch", series=series_id):
+        resp = session.get(FRED_BASE_URL, params=params, **kwargs)
+        resp.raise_for_status()
+    with span("parse", series=series_id):
+        return parse_observations(resp.json().get("observations", []))
+
+def fetch_many(session: requests.Session, series_ids: Iterable[str], api_key: str, start: str,
+               end: Optional[str] = None, max_workers: int = 4,
+               timeouts: Optional[Dict[str, int]] = None,
+               starts: Optional[Dict[str, str]] = None) -> Tuple[Dict[str, Rows], Dict[str, Exception]]:
+    """
+    Fetch several series in parallel. Returns (results, errors), both keyed by series_id.
+    `timeouts` and `starts` optionally override the timeout / observation_start per series.
+    Wall-clock time is bounded by the slowest series, not the sum of all of them.
+    """
+    series_ids = list(dict.fromkeys(series_ids))
+    timeouts = timeouts or {}
+    starts = starts or {}
+    results: Dict[str, Rows] = {}
+    errors: Dict[str, Exception] = {}
+    if not series_ids:
+        return results, errors
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(series_ids)))) as pool:
+        futures = {
+            sid: pool.submit(fetch_series, session, sid, api_key, starts.get(sid, start), end, timeouts.get(sid))
+            for sid in series_ids
+        }
+        for sid, fut in futures.items():
+            try:
+                results[sid] = fut.result()
+                log.info("Fetched %d observations for %s", len(results[sid]), sid)
+            except Exception as e:
+                errors[sid] = e
+                log.warning("Failed to fetch %s: %s", sid, e)
+    return results, errors
@@ -0,0 +1,256 @@
+"""
+On-disk HTTP response cache shared by all fetchers.
+
+Responses are keyed by method + URL (query params sorted, credentials such as
+api_key stripped) and stored under HTTP_CACHE_DIR as '<key>.json' (metadata)
+plus '<key>.body'. The cache plugs into requests as a transport adapter, so the
+retry policy from http_session.build_session still applies underneath it.
+
+- Fresh entries (younger than the per-host TTL) are served without a request.
+- Stale entries are revalidated with If-None-Match / If-Modified-Since; a 304
+  refreshes the entry and serves the stored body.
+- Total body size is bounded; least recently used entries are evicted first.
+- Replay mode serves recorded responses only and never touches the network,
+  which makes runs reproducible on an offline machine.
+
+Environment variables:
+  HTTP_CACHE_MODE    'on' (default), 'off', or 'replay'
+  HTTP_CACHE_DIR     cache directory (default: '.cache/http')
+  HTTP_CACHE_MAX_MB  size bound for stored bodies (default: 256)
+  HTTP_CACHE_TTLS    per-host TTL seconds, e.g. 'api.stlouisfed.org=3600,www.federalregister.gov=21600'
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+log = logging.getLogger("http-cache")
+
+# Seconds a response stays fresh without revalidation, by host
+DEFAULT_TTLS: Dict[str, int] = {
+    "api.stlouisfed.org": 3600,
+    "www.federalregister.gov": 6 * 3600,
+    "www.apple.com": 12 * 3600,
+    "www.edmunds.com": 12 * 3600,
+}
+DEFAULT_TTL = 3600
+
+# Query parameters that must never become part of a cache key
+SECRET_PARAMS = {"api_key", "apikey", "key", "token"}
+
+MODES = ("on", "off", "replay")
+
+
+class CacheMiss(requests.ConnectionError):
+    """Raised in replay mode when no recorded response exists for a request."""
+
+
+class ResponseCache:
+    def __init__(self, directory: str, max_bytes: int, ttls: Optional[Dict[str, int]] = None,
+                 default_ttl: int = DEFAULT_TTL, replay: bool = False):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.default_ttl = default_ttl
+        self.replay = replay
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._size = sum(
+            os.path.getsize(os.path.join(directory, n))
+            for n in os.listdir(directory) if n.endswith(".body")
+        )
+
+    # ---- keys & paths ----
+    @staticmethod
+    def canonical_url(url: str) -> str:
+        """`url` with sorted query parameters and SECRET_PARAMS removed."""
+        parts = urlsplit(url)
+        query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                       if k.lower() not in SECRET_PARAMS)
+        return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ""))
+
+    @staticmethod
+    def key_for(method: str, url: str) -> str:
+        canon = ResponseCache.canonical_url(url)
+        return hashlib.sha256(f"{method.upper()} {canon}".encode("utf-8")).hexdigest()
+
+    def _paths(self, key: str) -> Tuple[str, str]:
+        base = os.path.join(self.directory, key)
+        return base + ".json", base + ".body"
+
+    def ttl_for(self, url: str) -> int:
+        return self.ttls.get(urlsplit(url).hostname or "", self.default_ttl)
+
+    # ---- read/write ----
+    def get(self, key: str) -> Optional[Tuple[dict, bytes]]:
+        meta_path, body_path = self._paths(key)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        os.utime(body_path)  # LRU bookkeeping
+        return meta, body
+
+    def put(self, key: str, resp: requests.Response):
+        meta = {
+            # Never the raw URL: it can carry an API key (the cache dir is uploaded by CI)
+            "url": self.canonical_url(resp.url),
+            "status": resp.status_code,
+            "headers": dict(resp.headers),
+            "stored_at": time.time(),
+        }
+        body = resp.content
+        meta_path, body_path = self._paths(key)
+        with self._lock:
+            old = os.path.getsize(body_path) if os.path.exists(body_path) else 0
+            _atomic_write(body_path, body)
+            _atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+            self._size += len(body) - old
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def touch(self, key: str, headers) -> dict:
+        """Mark an entry fresh again after a 304, merging validator headers."""
+        meta_path, _ = self._paths(key)
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        for h in ("ETag", "Last-Modified", "Cache-Control", "Expires"):
+            if h in headers:
+                meta["headers"][h] = headers[h]
+        meta["stored_at"] = time.time()
+        meta["url"] = self.canonical_url(meta.get("url", ""))  # entries written before it was stripped
+        with self._lock:
+            _atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+        return meta
+
+    def is_fresh(self, meta: dict) -> bool:
+        return time.time() - meta.get("stored_at", 0) < self.ttl_for(meta.get("url", ""))
+
+    def _evict(self):
+        bodies = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".body"):
+                path = os.path.join(self.directory, name)
+                st = os.stat(path)
+                bodies.append((st.st_mtime, st.st_size, path))
+        bodies.sort()
+        target = int(self.max_bytes * 0.9)
+        for _, size, path in bodies:
+            if self._size <= target:
+                break
+            for p in (path, path[:-len(".body")] + ".json"):
+                try:
+                    os.remove(p)
+                except OSError:
+                    pass
+            self._size -= size
+        log.info("HTTP cache evicted down to %d bytes", self._size)
+
+
+class CachingAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that answers GETs from a ResponseCache when possible.
+    Served responses carry an 'X-Cache' header: HIT, REVALIDATED, REPLAY or MISS.
+    """
+
+    def __init__(self, cache: ResponseCache, **kwargs):
+        self.cache = cache
+        super().__init__(**kwargs)
+
+    def send(self, request, stream=False, **kwargs):
+        if request.method != "GET" or stream:
+            return super().send(request, stream=stream, **kwargs)
+
+        key = self.cache.key_for(request.method, request.url)
+        entry = self.cache.get(key)
+        if self.cache.replay:
+            if entry is None:
+                raise CacheMiss(f"No recorded response for {request.url}", request=request)
+            return self._build(request, entry[0], entry[1], "REPLAY")
+        if entry is not None:
+            meta, body = entry
+            if self.cache.is_fresh(meta):
+                return self._build(request, meta, body, "HIT")
+            headers = CaseInsensitiveDict(meta["headers"])
+            if "ETag" in headers:
+                request.headers["If-None-Match"] = headers["ETag"]
+            if "Last-Modified" in headers:
+                request.headers["If-Modified-Since"] = headers["Last-Modified"]
+
+        resp = super().send(request, stream=stream, **kwargs)
+        if resp.status_code == 304 and entry is not None:
+            meta = self.cache.touch(key, resp.headers)
+            resp.close()
+            return self._build(request, meta, entry[1], "REVALIDATED")
+        if resp.status_code == 200:
+            self.cache.put(key, resp)
+        resp.headers["X-Cache"] = "MISS"
+        return resp
+
+    def _build(self, request, meta: dict, body: bytes, how: str) -> requests.Response:
+        resp = requests.Response()
+        resp.status_code = meta.get("status", 200)
+        resp.reason = "OK"
+        resp.headers = CaseInsensitiveDict(meta.get("headers", {}))
+        resp.headers["X-Cache"] = how
+        resp.encoding = get_encoding_from_headers(resp.headers)
+        resp._content = body
+        resp.url = request.url
+        resp.request = request
+        resp.connection = self
+        return resp
+
+
+def _atomic_write(path: str, data: bytes):
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+def _parse_ttls(spec: str) -> Dict[str, int]:
+    out: Dict[str, int] = {}
+    for item in spec.split(","):
+        host, _, secs = item.partition("=")
+        if host.strip() and secs.strip().isdigit():
+            out[host.strip()] = int(secs)
+    return out
+
+_caches: Dict[Tuple, Optional[ResponseCache]] = {}
+_caches_lock = threading.Lock()
+
+def cache_from_env() -> Optional[ResponseCache]:
+    """
+    Build the shared ResponseCache from HTTP_CACHE_* variables, or None when disabled.
+    Memoized per configuration, so every session in a process (e.g. all stages of
+    `python -m updater run`) shares one cache and one LRU budget.
+    """
+    mode = (os.getenv("HTTP_CACHE_MODE") or "on").lower()
+    if mode not in MODES:
+        log.warning("Unknown HTTP_CACHE_MODE=%s; caching disabled", mode)
+        return None
+    if mode == "off":
+        return None
+    key = (mode, os.getenv("HTTP_CACHE_DIR") or ".cache/http",
+           os.getenv("HTTP_CACHE_MAX_MB") or "256", os.getenv("HTTP_CACHE_TTLS") or "")
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = ResponseCache(
+                directory=key[1],
+                max_bytes=int(key[2]) * 1024 * 1024,
+                ttls=_parse_ttls(key[3]),
+                replay=(mode == "replay"),
+            )
+        return _caches[key]
@@ -0,0 +1,57 @@
+"""
+Shared HTTP session factory: one pooled, keep-alive requests.Session with a
+resilient retry policy, a default per-request timeout and, optionally, the
+on-disk response cache from http_cache.
+"""
+
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from http_cache import CachingAdapter, ResponseCache
+from telemetry import telemetry
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def build_session(timeout: int, max_retries: int, pool_maxsize: int = 10,
+                  cache: Optional[ResponseCache] = None,
+                  retry_statuses=RETRY_STATUSES) -> requests.Session:
+    """
+    Create a requests Session with resilient retry policy for common transient failures.
+    pool_maxsize should be at least the number of threads sharing the session.
+    When a ResponseCache is given, GETs are served/revalidated through it.
+    Callers that handle 429 themselves (see rate_limit.limited_get) can drop it
+    from retry_statuses.
+    """
+    session = requests.Session()
+    retry = Retry(
+        total=max_retries,
+        connect=max_retries,
+        read=max_retries,
+        backoff_factor=0.8,              # exponential backoff with jitter-ish spacing
+        status_forcelist=retry_statuses,
+        allowed_methods=("GET",),
+        raise_on_status=False,
+        respect_retry_after_header=True,
+    )
+    if cache is not None:
+        adapter = CachingAdapter(cache, max_retries=retry, pool_maxsize=pool_maxsize)
+    else:
+        adapter = HTTPAdapter(max_retries=retry, pool_maxsize=pool_maxsize)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    # Store default timeout on the session
+    session.request = _with_timeout(session.request, timeout)
+    # Request/byte/retry counters for the run report
+    telemetry.instrument_session(session)
+    return session
+
+def _with_timeout(request_fn, timeout):
+    def wrapped(method, url, **kwargs):
+        if "timeout" not in kwargs:
+            kwargs["timeout"] = timeout
+        return request_fn(method, url, **kwargs)
+    return wrapped
@@ -1,28 +1,61 @@
-
+import atexit
 import os
-import json
-import gspread
+import threading
 from datetime import datetime
-from google.oauth2.service_account import Credentials
+from sheets_client import open_spreadsheet
+from telemetry import span
 
-def log_update(tab_name, row_count, update_type, note, source_url):
-    # Authenticate using environment secrets
-    scopes = [
-        "https://www.googleapis.com/auth/spreadsheets",
-        "https://www.googleapis.com/auth/drive"
-    ]
-    creds_dict = json.loads(os.environ["GOOGLE_CREDENTIALS"])
-    credentials = Credentials.from_service_account_info(creds_dict, scopes=scopes)
-    gc = gspread.authorize(credentials)
-    sheet = gc.open_by_key(os.environ["GOOGLE_SHEET_ID"])
+# Entries are buffered and written with a single append_rows call at exit,
+# or as soon as this many entries are pending.
+FLUSH_THRESHOLD = int(os.getenv("UPDATE_LOG_FLUSH_ROWS", "25"))
+
+LOG_HEADER = ["Timestamp", "Tab Updated", "Row Count", "Update Type", "Notes", "Source"]
+
+_pending = []
+_lock = threading.Lock()
+_atexit_registered = False
+
+_worksheet = (None, None)  # (spreadsheet, its Update_Notes worksheet)
+
+def _log_worksheet():
+    global _worksheet
+    import gspread
+
+    sheet = open_spreadsheet()
+    if _worksheet[0] is sheet:
+        return _worksheet[1]
 
     # Ensure the log worksheet exists
     try:
         log_ws = sheet.worksheet("Update_Notes")
     except gspread.exceptions.WorksheetNotFound:
         log_ws = sheet.add_worksheet(title="Update_Notes", rows="100", cols="6")
-        log_ws.update("A1:F1", [["Timestamp", "Tab Updated", "Row Count", "Update Type", "Notes", "Source"]])
+        log_ws.update("A1:F1", [LOG_HEADER])
+    _worksheet = (sheet, log_ws)
+    return log_ws
 
+def log_update(tab_name, row_count, update_type, note, source_url):
+    global _atexit_registered
     # Create the log entry
     timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
-    log_ws.append_row([timestamp, tab_name, row_count, update_type, note, source_url])
+    with _lock:
+        _pending.append([timestamp, tab_name, row_count, update_type, note, source_url])
+        if not _atexit_registered:
+            atexit.register(flush_updates)
+            _atexit_registered = True
+        full = len(_pending) >= FLUSH_THRESHOLD
+    if full:
+        flush_updates()
+
+def flush_updates():
+    """Write all buffered log entries to Update_Notes in one request."""
+    with _lock:
+        rows = _pending[:]
+        del _pending[:]
+    if not rows:
+        return
+    try:
+        with span("sheet_write", tab="Update_Notes"):
+            _log_worksheet().append_rows(rows)
+    except Exception as e:
+        print(f"❌ Failed to write {len(rows)} update log entries:", str(e))
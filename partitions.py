@@ -0,0 +1,129 @@
+"""
+Date-partitioned JSON output with a manifest index.
+
+A table of records (each with a 'YYYY-MM-DD' date column) is split into one
+file per month ('2025-10.json') or quarter ('2025-Q4.json') inside a directory,
+next to a small manifest:
+
+  {"format": "partitioned-json", "version": 1, "partition": "month", "total": n,
+   "partitions": [{"key": "2025-10", "file": "2025-10.json",
+                   "start": "2025-10-01", "end": "2025-10-31",
+                   "count": 123, "sha256": "..."}, ...]}
+
+start/end are the partition's calendar bounds, so a client can fetch just the
+partitions overlapping the range it displays. Each partition's hash covers its
+serialized bytes: files whose hash is unchanged are not rewritten, files of
+partitions that disappeared are removed, and the manifest is replaced
+atomically, so a daily run touches only the partitions with new documents.
+Rows without a parseable date go to an 'undated' partition.
+
+Input is consumed as a stream ordered by date, so only one partition is held
+in memory at a time, however long the history.
+"""
+
+import hashlib
+import json
+import os
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from fileio import write_atomic
+
+FORMAT = "partitioned-json"
+VERSION = 1
+MANIFEST = "manifest.json"
+SCHEMES = ("month", "quarter")
+UNDATED = "undated"
+
+
+def partition_bounds(day: str, scheme: str) -> Tuple[str, str, str]:
+    """(key, first day, last day) of the partition holding `day`."""
+    d = date.fromisoformat(day[:10])
+    if scheme == "month":
+        first_month, months, key = d.month, 1, f"{d.year}-{d.month:02d}"
+    elif scheme == "quarter":
+        q = (d.month - 1) // 3
+        first_month, months, key = 3 * q + 1, 3, f"{d.year}-Q{q + 1}"
+    else:
+        raise ValueError(f"Unknown partition scheme: {scheme}")
+    start = date(d.year, first_month, 1)
+    nxt = first_month + months
+    end = date(d.year + (nxt > 12), (nxt - 1) % 12 + 1, 1).toordinal() - 1
+    return key, start.isoformat(), date.fromordinal(end).isoformat()
+
+def load_manifest(directory: str) -> Optional[Dict]:
+    path = os.path.join(directory, MANIFEST)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def iter_partitioned(directory: str) -> Iterator[Dict]:
+    """Stream every row of a partitioned output, partition by partition."""
+    for p in (load_manifest(directory) or {}).get("partitions", []):
+        with open(os.path.join(directory, p["file"]), "r", encoding="utf-8") as f:
+            yield from json.load(f)
+
+def _partition_of(row: Dict, scheme: str, date_key: str) -> Tuple[str, str, str]:
+    try:
+        return partition_bounds(str(row.get(date_key, "")), scheme)
+    except ValueError:
+        return UNDATED, "", ""
+
+def _grouped(rows: Iterable[Dict], scheme: str, date_key: str) -> Iterator[Tuple[Tuple[str, str, str], List[Dict]]]:
+    done = set()
+    bounds, part = None, []
+    for r in rows:
+        b = _partition_of(r, scheme, date_key)
+        if b != bounds:
+            if bounds is not None:
+                yield bounds, part
+                done.add(bounds[0])
+            if b[0] in done:
+                raise ValueError(f"Rows are not ordered by {date_key}: partition {b[0]} seen twice")
+            bounds, part = b, []
+        part.append(r)
+    if bounds is not None:
+        yield bounds, part
+
+def write_partitioned(rows: Iterable[Dict], directory: str, scheme: str = "month",
+                      date_key: str = "Date") -> Tuple[List[str], List[str]]:
+    """
+    Write `rows` (ordered by date; undated rows first or last) as partitions
+    plus manifest. Returns (partition files rewritten, partition files removed).
+    """
+    os.makedirs(directory, exist_ok=True)
+    old = load_manifest(directory) or {}
+    old_hashes = {p["file"]: p.get("sha256") for p in old.get("partitions", [])}
+
+    written: List[str] = []
+    entries: List[Dict] = []
+    for (key, start, end), part in _grouped(rows, scheme, date_key):
+        data = json.dumps(part, indent=2, ensure_ascii=False).encode("utf-8")
+        g = {"key": key, "file": f"{key}.json", "start": start, "end": end,
+             "count": len(part), "sha256": hashlib.sha256(data).hexdigest()}
+        path = os.path.join(directory, g["file"])
+        if old_hashes.get(g["file"]) != g["sha256"] or not os.path.exists(path):
+            write_atomic(path, data)
+            written.append(path)
+        entries.append(g)
+    entries.sort(key=lambda g: (g["key"] == UNDATED, g["key"]))
+
+    removed: List[str] = []
+    for name in set(old_hashes) - {g["file"] for g in entries}:
+        path = os.path.join(directory, name)
+        if os.path.exists(path):
+            os.remove(path)
+            removed.append(path)
+
+    manifest = {
+        "format": FORMAT,
+        "version": VERSION,
+        "partition": scheme,
+        "total": sum(g["count"] for g in entries),
+        "partitions": entries,
+    }
+    if manifest != old:
+        write_atomic(os.path.join(directory, MANIFEST),
+                     json.dumps(manifest, indent=2, ensure_ascii=False).encode("utf-8"))
+    return written, removed
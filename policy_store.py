@@ -0,0 +1,165 @@
+"""
+Local Federal Register document store keyed by document_number.
+
+The store is a SQLite file (default 'state/policy_store.db'):
+  documents (key PRIMARY KEY, date, title, type, url, record)
+indexed on the output order (date, title, type, url), so Policy_Events is
+regenerated by streaming the store from disk in order; memory does not grow
+with history. A new store is seeded once from whichever older copy exists: a
+legacy JSON store next to it ({"version": 1, "documents": {...}}), the
+partitioned output, or a single Policy_Events.json.
+
+Each run merges freshly fetched records into it (newer fetches replace older
+copies of the same document, so corrections propagate), and Policy_Events is
+regenerated from the whole store. The tracker only has to fetch from the
+last-seen publication date minus a small overlap, so run cost scales with new
+documents rather than total history.
+
+The same file holds the search index (search_index.py), updated in the same
+transaction as each added or changed document.
+"""
+
+import json
+import os
+import re
+import sqlite3
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import search_index
+
+# .../documents/2025/10/01/2025-19234/slug -> 2025-19234
+_DOC_NUMBER_RE = re.compile(r"/documents/\d{4}/\d{2}/\d{2}/([^/?#]+)")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    key     TEXT PRIMARY KEY,
+    date    TEXT NOT NULL,
+    title   TEXT NOT NULL,
+    type    TEXT NOT NULL,
+    url     TEXT NOT NULL,
+    record  TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS documents_order ON documents (date, title, type, url);
+"""
+
+
+def document_number_from_url(url: str) -> Optional[str]:
+    m = _DOC_NUMBER_RE.search(url or "")
+    return m.group(1) if m else None
+
+def record_key(record: Dict) -> str:
+    """
+    Stable store key: the FR document_number, recovered from the URL for
+    legacy records; (Date, Title) only as a last resort.
+    """
+    return (
+        record.get("document_number")
+        or document_number_from_url(record.get("Source URL", ""))
+        or f"{record.get('Date', '')}|{record.get('Title', '')}"
+    )
+
+def _read_seed(path: str) -> Iterator[Dict]:
+    """Records from a legacy JSON store, a partition directory or a JSON array file."""
+    from partitions import iter_partitioned, load_manifest
+
+    if os.path.isdir(path):
+        if load_manifest(path) is not None:
+            yield from iter_partitioned(path)
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    yield from (data.get("documents", {}).values() if isinstance(data, dict) else data)
+
+
+class PolicyStore:
+    def __init__(self, path: str, seed_paths: Iterable[str] = (), read_only: bool = False):
+        """
+        Open (creating, migrating and seeding as needed) the store at `path`.
+        With read_only=True an existing store is opened as is, for readers;
+        sqlite3.OperationalError if it doesn't exist.
+        """
+        self.path = path
+        if read_only:
+            self.db = sqlite3.connect(f"file:{path}?mode=ro", uri=True, isolation_level=None)
+            return
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.db = sqlite3.connect(path, isolation_level=None)
+        self.db.executescript(SCHEMA)
+        self.db.executescript(search_index.SCHEMA)
+        if not len(self):
+            legacy = os.path.splitext(path)[0] + ".json"
+            for seed in [legacy, *seed_paths]:
+                if seed != path and os.path.exists(seed):
+                    self.merge(_read_seed(seed))
+                    if len(self):
+                        break
+        self._reindex()
+
+    def __len__(self) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def close(self):
+        self.db.close()
+
+    def _reindex(self, batch: int = 1000):
+        """Index documents stored before the search index existed."""
+        pending = list(search_index.unindexed(self.db).fetchmany(batch))
+        while pending:
+            self.db.execute("BEGIN")
+            for key, blob in pending:
+                search_index.index_document(self.db, key, json.loads(blob))
+            self.db.execute("COMMIT")
+            pending = search_index.unindexed(self.db).fetchmany(batch)
+
+    def merge(self, records: Iterable[Dict], batch: int = 1000) -> Tuple[int, int]:
+        """
+        Upsert records (any iterable, consumed lazily; committed every `batch`
+        rows). Returns (added, changed) counts.
+        """
+        added = changed = pending = 0
+        self.db.execute("BEGIN")
+        try:
+            for r in records:
+                k = record_key(r)
+                blob = json.dumps(r, ensure_ascii=False, sort_keys=True)
+                old = self.db.execute("SELECT record FROM documents WHERE key = ?", (k,)).fetchone()
+                if old is None:
+                    added += 1
+                elif old[0] != blob:
+                    changed += 1
+                else:
+                    continue
+                self.db.execute(
+                    "INSERT OR REPLACE INTO documents (key, date, title, type, url, record) VALUES (?, ?, ?, ?, ?, ?)",
+                    (k, r.get("Date", "") or "", r.get("Title", "") or "", r.get("Type", "") or "",
+                     r.get("Source URL", "") or "", blob),
+                )
+                search_index.index_document(self.db, k, r)
+                pending += 1
+                if pending >= batch:
+                    self.db.execute("COMMIT")
+                    self.db.execute("BEGIN")
+                    pending = 0
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        self.db.execute("COMMIT")
+        return added, changed
+
+    def last_publication_date(self) -> Optional[str]:
+        return self.db.execute("SELECT MAX(date) FROM documents").fetchone()[0] or None
+
+    def events(self) -> List[Tuple[str, str]]:
+        """(key, date) of every dated document, in output order."""
+        return self.db.execute(
+            "SELECT key, date FROM documents WHERE date != '' ORDER BY date, title, type, url").fetchall()
+
+    def export_index(self, path: str) -> int:
+        """Write the search index file (see search_index.py); returns documents indexed."""
+        return search_index.export(self.db, path)
+
+    def iter_sorted(self) -> Iterator[Dict]:
+        """All records by (Date, Title, Type, Source URL), streamed from the index."""
+        cur = self.db.execute("SELECT record FROM documents ORDER BY date, title, type, url")
+        for (blob,) in cur:
+            yield json.loads(blob)
@@ -1,39 +1,99 @@
 #!/usr/bin/env python3
 """
-Policy tracker: fetches Federal Register documents for a date window, writes JSON,
+Policy tracker: fetches new Federal Register documents, merges them into a local
+store keyed by document_number, regenerates the JSON output from the store,
 and (optionally) syncs to a Google Sheet.
 
 Environment variables (all optional unless noted):
-  START_DATE         e.g., '2025-10-01' (default: 30 days ago)
+  START_DATE         e.g., '2025-10-01' (default: last stored publication date minus
+                     POLICY_OVERLAP_DAYS, or 30 days ago for an empty store)
   END_DATE           e.g., '2025-11-11' (default: today)
   FR_TYPES           comma list of document types, e.g. 'PRORULE,NOTICE' (default: 'PRORULE')
-  CHUNK_DAYS         integer chunk size, e.g. '7' (default: 7)
+  CHUNK_DAYS         fallback chunk size when daily counts are unavailable (default: 7)
+  FR_PER_PAGE        page size, capped at the API maximum of 1000 (default: 1000)
+  FR_MAX_RESULTS     results one query can page through before it must be split (default: 10000)
   REQUEST_TIMEOUT    per-request timeout seconds, e.g. '20' (default: 20)
   MAX_RETRIES        retry count for transient errors (default: 5)
+  FR_WORKERS         concurrent (type, window) fetches (default: 4)
+  FR_RATE_LIMIT      max requests per second across all workers (default: 5)
   DATA_OUT           output JSON path (default: 'docs/data/Policy_Events.json')
+  POLICY_PARTITION   'month' (default) or 'quarter': write DATA_OUT's records as
+                     date partitions plus manifest.json in a directory named after
+                     DATA_OUT (e.g. docs/data/Policy_Events/), and remove a stale
+                     single-file DATA_OUT; 'none' writes the single JSON file (and
+                     its columnar copy) instead, or NDJSON when DATA_OUT ends in
+                     '.ndjson'. The policy store is the only source of these files.
+  POLICY_STORE       document store path (default: 'state/policy_store.db'; a legacy
+                     'state/policy_store.json' is imported on first use)
+  POLICY_STREAM      '1' for bounded-memory streaming (large backfills): fetched pages
+                     are spilled as sorted NDJSON runs and merged from disk
+  POLICY_RUN_ROWS    records per sorted run in streaming mode (default: 5000)
+  POLICY_OVERLAP_DAYS  days re-fetched before the last stored date (default: 3)
+  SEARCH_INDEX       search index output (default: DATA_OUT with '.search.json'; 'none'
+                     disables it)
+  HTTP_CACHE_MODE    'on' (default), 'off' or 'replay' (see http_cache.py)
 
 Optional Google Sheets sync:
   GOOGLE_CREDENTIALS  JSON string of a service account
   GOOGLE_SHEET_ID     target Google Sheet ID (not URL)
+  SHEET_INDEX         synced-row key index (default: DATA_OUT with '.sheet_index.json')
 
 Notes:
-- Robust retry with backoff (429/5xx/connect/read) using a single Session.
-- Paginates per_page=100 until no more results.
-- Normalizes 'agencies' to a clean 'Agency' string (handles None/missing names).
-- If Sheet sync is enabled, ensures headers are set exactly and appends new rows
-  by de-duplicating on (Date, Title) keys. Avoids get_all_records() header pitfalls.
+- Robust retry with backoff (5xx/connect/read) using a single pooled Session.
+- (type, window) work items are fetched by a thread pool behind a shared
+  token bucket; a 429 pauses every worker until Retry-After has passed.
+  Output order is independent of completion order.
+- Query planner: one facets/daily request per type yields per-day counts, and
+  consecutive days are packed into windows of at most one page each (dense
+  days stand alone, sparse stretches merge, empty stretches join a neighbour
+  so the windows still cover every day). Each window's first page is checked
+  against its facet total; on a mismatch (e.g. a day the facet left out) the
+  window is re-fetched as plain CHUNK_DAYS windows. Without counts it uses
+  CHUNK_DAYS windows throughout, halving any window whose count exceeds
+  FR_MAX_RESULTS.
+- Requests only the mapped fields via fields[], at the largest page size, and
+  reads count/total_pages from the first page instead of probing for an empty page.
+- Normalizes 'agencies' to a clean 'Agency' string (handles None/missing names);
+  the list itself is kept in the store as 'Agencies' for the agency facets.
+- Writes a prebuilt inverted index (search_index.py): title/abstract terms ->
+  documents, agency/type facets and monthly histograms. It is maintained in the
+  store as documents are merged and re-exported only when documents changed.
+- Partitioned output (partitions.py) rewrites only partitions whose content
+  hash changed, so daily commits stay proportional to the new documents.
+- Output is streamed from the SQLite store in order; in streaming mode the
+  fetched records never sit in memory as a whole either: each work item's
+  pages flow into sorted runs (external_sort.py), which are merged, deduped
+  and upserted record by record.
+- If Sheet sync is enabled, appends only rows whose document_number is not in
+  the local key index (sheet_index.py). The index is verified with a tail-range
+  read; the full tab is downloaded only to rebuild it, which also fixes the
+  header row. Avoids get_all_records() header pitfalls.
 """
 
 import json
 import logging
 import os
+import shutil
 import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+
+from columnar import write_columnar
+from external_sort import RunWriter, dedup_sorted, merge_runs, write_ndjson
+from fileio import write_if_changed
+from partitions import SCHEMES, write_partitioned
+from http_cache import cache_from_env
+from http_session import build_session
+from policy_store import PolicyStore, record_key
+from rate_limit import TokenBucket, limited_get
+from telemetry import run_report, span
+from sheet_index import (
+    build_index, index_path_for, key_hash, load_index, row_fingerprint, save_index,
+)
 
 # ==== Logging ====
 logging.basicConfig(
@@ -53,6 +113,12 @@ def getenv_int(name: str, default: int) -> int:
     except ValueError:
         return default
 
+def getenv_float(name: str, default: float) -> float:
+    try:
+        return float(getenv_str(name, str(default)))
+    except ValueError:
+        return default
+
 DATE_FMT = "%Y-%m-%d"
 
 def parse_date(s: str) -> datetime:
@@ -71,45 +137,45 @@ FR_TYPES = [t.strip() for t in getenv_str("FR_TYPES", "PRORULE").split(",") if t
 CHUNK_DAYS = getenv_int("CHUNK_DAYS", 7)
 REQUEST_TIMEOUT = getenv_int("REQUEST_TIMEOUT", 20)
 MAX_RETRIES = getenv_int("MAX_RETRIES", 5)
+FR_PER_PAGE = min(max(1, getenv_int("FR_PER_PAGE", 1000)), 1000)
+FR_MAX_RESULTS = getenv_int("FR_MAX_RESULTS", 10000)
+FR_WORKERS = max(1, getenv_int("FR_WORKERS", 4))
+FR_RATE_LIMIT = getenv_float("FR_RATE_LIMIT", 5.0)
 DATA_OUT = getenv_str("DATA_OUT", "docs/data/Policy_Events.json")
+POLICY_PARTITION = getenv_str("POLICY_PARTITION", "month").lower()
+POLICY_STORE = getenv_str("POLICY_STORE", "state/policy_store.db")
+POLICY_STREAM = getenv_str("POLICY_STREAM", "") not in ("", "0", "false")
+POLICY_RUN_ROWS = max(1, getenv_int("POLICY_RUN_ROWS", 5000))
+SHEET_APPEND_ROWS = 5000
+POLICY_OVERLAP_DAYS = getenv_int("POLICY_OVERLAP_DAYS", 3)
+SHEET_INDEX = getenv_str("SHEET_INDEX", "")
+SEARCH_INDEX = getenv_str("SEARCH_INDEX", os.path.splitext(DATA_OUT)[0] + ".search.json")
 
 GOOGLE_CREDENTIALS = os.getenv("GOOGLE_CREDENTIALS")
 GOOGLE_SHEET_ID = os.getenv("GOOGLE_SHEET_ID")
 
 EXPECTED_HEADERS = ["Date", "Type", "Title", "Description", "Agency", "Source URL"]
 
-# ==== HTTP Session with retries ====
-def build_session(timeout: int, max_retries: int) -> requests.Session:
-    """
-    Create a requests Session with resilient retry policy for common transient failures.
-    """
-    session = requests.Session()
-    retry = Retry(
-        total=max_retries,
-        connect=max_retries,
-        read=max_retries,
-        backoff_factor=0.8,              # exponential backoff with jitter-ish spacing
-        status_forcelist=(429, 500, 502, 503, 504),
-        allowed_methods=("GET",),
-        raise_on_status=False,
-        respect_retry_after_header=True,
-    )
-    adapter = HTTPAdapter(max_retries=retry, pool_maxsize=10)
-    session.mount("https://", adapter)
-    session.mount("http://", adapter)
-    # Store default timeout on the session
-    session.request = _with_timeout(session.request, timeout)
-    return session
-
-def _with_timeout(request_fn, timeout):
-    def wrapped(method, url, **kwargs):
-        if "timeout" not in kwargs:
-            kwargs["timeout"] = timeout
-        return request_fn(method, url, **kwargs)
-    return wrapped
-
 # ==== Federal Register fetch ====
-BASE_URL = "https://www.federalregister.gov/api/v1/documents.json"
+FR_API_ROOT = getenv_str("FR_API_ROOT", "https://www.federalregister.gov/api/v1")
+BASE_URL = f"{FR_API_ROOT}/documents.json"
+FACETS_DAILY_URL = f"{FR_API_ROOT}/documents/facets/daily"
+
+# Only the fields we map into records
+FR_FIELDS = ["title", "abstract", "agencies", "html_url", "publication_date", "document_number"]
+
+class WindowTooLarge(Exception):
+    """A window matches more documents than one query can page through."""
+    def __init__(self, count: int):
+        super().__init__(f"{count} results exceed FR_MAX_RESULTS={FR_MAX_RESULTS}")
+        self.count = count
+
+class FacetMismatch(Exception):
+    """A window's document count differs from its daily facet total."""
+    def __init__(self, count: int, expected: int):
+        super().__init__(f"{count} results, daily facet counted {expected}")
+        self.count = count
+        self.expected = expected
 
 def normalize_agency_names(raw_list) -> List[str]:
     """
@@ -140,49 +206,124 @@ def normalize_agency_names(raw_list) -> List[str]:
             uniq.append(n)
     return uniq
 
-def fetch_window(session: requests.Session, start: str, end: str, doc_type: str) -> List[Dict]:
+def _get(session: requests.Session, url: str, params: Dict, limiter: Optional[TokenBucket]) -> requests.Response:
+    if limiter is not None:
+        return limited_get(session, limiter, url, max_retries=MAX_RETRIES, params=params)
+    return session.get(url, params=params)
+
+def to_record(doc: Dict, doc_type: str) -> Dict:
+    agency_names = normalize_agency_names(doc.get("agencies", []))
+    return {
+        "Date": doc.get("publication_date", "") or "",
+        "Type": doc_type,
+        "Title": doc.get("title", "") or "",
+        "Description": (doc.get("abstract", "") or "").strip(),
+        "Agency": ", ".join(agency_names) if agency_names else "Unknown",
+        "Source URL": doc.get("html_url", "") or "",
+        "document_number": doc.get("document_number", "") or "",
+        "Agencies": agency_names,
+    }
+
+def iter_window(session: requests.Session, start: str, end: str, doc_type: str,
+                limiter: Optional[TokenBucket] = None, expected: Optional[int] = None) -> Iterator[Dict]:
     """
-    Fetch one date window for one doc_type, with pagination.
-    Returns list of normalized records.
+    Fetch one date window for one doc_type, with pagination, yielding
+    normalized records page by page.
+    The first page's count/total_pages drive the remaining requests; raises
+    WindowTooLarge (before yielding anything) if the window cannot be fully paged,
+    or FacetMismatch if `expected` (the planned facet total) is given and differs.
+    Requests go through `limiter` when given (429s back off all workers).
     """
+    params = {
+        "conditions[publication_date][gte]": start,
+        "conditions[publication_date][lte]": end,
+        "conditions[type]": doc_type,
+        "fields[]": FR_FIELDS,
+        "per_page": FR_PER_PAGE,
+        "order": "oldest",
+        # NOTE: add more filters if needed, e.g., agencies, topics, etc.
+    }
     page = 1
-    per_page = 100
-    acc: List[Dict] = []
-    while True:
-        params = {
-            "conditions[publication_date][gte]": start,
-            "conditions[publication_date][lte]": end,
-            "conditions[type]": doc_type,
-            "per_page": per_page,
-            "page": page,
-            # NOTE: add more filters if needed, e.g., agencies, topics, etc.
-        }
-        resp = session.get(BASE_URL, params=params)
+    total_pages = 1
+    while page <= total_pages:
+        resp = _get(session, BASE_URL, dict(params, page=page), limiter)
         if resp.status_code != 200:
             log.warning("Non-200 from FR API: %s %s", resp.status_code, resp.text[:200])
             break
         data = resp.json()
+        if page == 1:
+            count = data.get("count", 0) or 0
+            if expected is not None and count != expected:
+                raise FacetMismatch(count, expected)
+            if count > FR_MAX_RESULTS and start != end:
+                raise WindowTooLarge(count)
+            total_pages = data.get("total_pages") or 1
         docs = data.get("results", []) or []
         if not docs:
             break
         for doc in docs:
-            date = doc.get("publication_date", "") or ""
-            title = doc.get("title", "") or ""
-            desc = (doc.get("abstract", "") or "").strip()
-            link = doc.get("html_url", "") or ""
-            agency_names = normalize_agency_names(doc.get("agencies", []))
-            agency_str = ", ".join(agency_names) if agency_names else "Unknown"
-
-            acc.append({
-                "Date": date,
-                "Type": doc_type,
-                "Title": title,
-                "Description": desc,
-                "Agency": agency_str,
-                "Source URL": link,
-            })
+            yield to_record(doc, doc_type)
         page += 1
-    return acc
+
+def fetch_window(session: requests.Session, start: str, end: str, doc_type: str,
+                 limiter: Optional[TokenBucket] = None, expected: Optional[int] = None) -> List[Dict]:
+    """iter_window() as a list of normalized records."""
+    return list(iter_window(session, start, end, doc_type, limiter, expected))
+
+def fetch_daily_counts(session: requests.Session, start: str, end: str, doc_type: str,
+                       limiter: Optional[TokenBucket] = None) -> Optional[Dict[str, int]]:
+    """
+    Per-day document counts for doc_type in [start..end] from the daily facet,
+    or None if the facet endpoint is unavailable.
+    """
+    params = {
+        "conditions[publication_date][gte]": start,
+        "conditions[publication_date][lte]": end,
+        "conditions[type]": doc_type,
+    }
+    try:
+        resp = _get(session, FACETS_DAILY_URL, params, limiter)
+        if resp.status_code != 200:
+            log.warning("Daily facet unavailable (%s); using %d-day chunks", resp.status_code, CHUNK_DAYS)
+            return None
+        data = resp.json()
+    except (requests.RequestException, ValueError) as e:
+        log.warning("Daily facet failed (%s); using %d-day chunks", e, CHUNK_DAYS)
+        return None
+    counts: Dict[str, int] = {}
+    for day, v in data.items():
+        n = v.get("count", 0) if isinstance(v, dict) else v
+        if start <= day <= end and n:
+            counts[day] = int(n)
+    return counts
+
+def pack_windows(counts: Dict[str, int], target: int, start: str, end: str) -> List[Tuple[str, str, int]]:
+    """
+    Merge consecutive non-empty days into windows holding at most `target` documents
+    (a single day above target becomes its own window), as (start, end, facet total).
+    Empty stretches join the preceding window (the first one: the next), so the
+    windows cover all of [start..end] and a day missing from the facet is still
+    fetched; the mismatch with the facet total then shows on the first page.
+    """
+    packed: List[List] = []
+    for day in sorted(counts):
+        n = counts[day]
+        if not packed or packed[-1][2] + n > target:
+            packed.append([day, day, 0])
+        packed[-1][1] = day
+        packed[-1][2] += n
+    if not packed:
+        return [(start, end, 0)]
+    for prev, nxt in zip(packed, packed[1:]):
+        prev[1] = fmt_date(parse_date(nxt[0]) - timedelta(days=1))
+    packed[0][0] = start
+    packed[-1][1] = end
+    return [(a, b, n) for a, b, n in packed]
+
+def split_window(start: str, end: str) -> List[Tuple[str, str]]:
+    a, b = parse_date(start), parse_date(end)
+    mid = a + (b - a) // 2
+    return [(fmt_date(a), fmt_date(mid)), (fmt_date(mid + timedelta(days=1)), fmt_date(b))]
 
 def daterange_chunks(start: datetime, end: datetime, days: int) -> List[Tuple[str, str]]:
     """
@@ -200,28 +341,49 @@ def daterange_chunks(start: datetime, end: datetime, days: int) -> List[Tuple[st
 def ensure_parent_dir(path: str):
     os.makedirs(os.path.dirname(path), exist_ok=True)
 
-def write_json(records: List[Dict], path: str):
+def remove_single_file(path: str) -> List[str]:
+    """Delete the single-file output and its columnar copies, left over from 'none' mode."""
+    col = os.path.splitext(path)[0] + ".col.json"
+    removed = []
+    for p in (path, col, col + ".gz", col + ".br"):
+        if os.path.exists(p):
+            os.remove(p)
+            removed.append(p)
+    return removed
+
+def write_json(records: Iterable[Dict], path: str):
+    """
+    Write records (in output order) to `path`: date partitions, NDJSON, or a
+    single JSON array. Partitions and NDJSON are written as a stream.
+    """
     ensure_parent_dir(path)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(records, f, indent=2, ensure_ascii=False)
+    rows = ({h: r.get(h, "") for h in EXPECTED_HEADERS} for r in records)
+    if path.endswith(".ndjson"):
+        with span("json_write", path=path):
+            write_ndjson(rows, path)
+        return
+    if POLICY_PARTITION in SCHEMES:
+        directory = os.path.splitext(path)[0]
+        with span("json_write", path=directory, partition=POLICY_PARTITION):
+            written, removed = write_partitioned(rows, directory, POLICY_PARTITION)
+        log.info("Partitions in %s: %d rewritten, %d removed", directory, len(written), len(removed))
+        # The partitions replace the single file; a stale copy would outlive them
+        for p in remove_single_file(path):
+            log.info("Removed legacy %s", p)
+        return
+    rows = list(rows)  # the columnar copy needs whole columns
+    with span("json_write", path=path):
+        write_if_changed(path, json.dumps(rows, indent=2, ensure_ascii=False).encode("utf-8"))
+        # Keep the dashboard's columnar copy in step with the JSON output
+        write_columnar(rows, os.path.splitext(path)[0] + ".col.json")
 
 # ==== Google Sheets sync (optional) ====
-def sync_google_sheet(records: List[Dict], sheet_id: str, credentials_json: str):
+def sync_google_sheet(records: Iterable[Dict], sheet_id: str, credentials_json: str):
     import gspread
-    from google.oauth2.service_account import Credentials
+    from sheets_client import open_spreadsheet
 
-    # Auth
-    scope = [
-        "https://www.googleapis.com/auth/spreadsheets",
-        "https://www.googleapis.com/auth/drive.file",
-        "https://www.googleapis.com/auth/drive",
-    ]
-    info = json.loads(credentials_json)
-    creds = Credentials.from_service_account_info(info, scopes=scope)
-    gc = gspread.authorize(creds)
-
-    # Open sheet
-    sh = gc.open_by_key(sheet_id)
+    # Open sheet (shared, cached client)
+    sh = open_spreadsheet(sheet_id, credentials_json)
 
     # Worksheet name fixed
     title = "Policy_Events"
@@ -230,91 +392,228 @@ def sync_google_sheet(records: List[Dict], sheet_id: str, credentials_json: str)
     except gspread.WorksheetNotFound:
         ws = sh.add_worksheet(title=title, rows=1000, cols=10)
 
-    # Ensure headers exactly once in row 1
-    current = ws.get_all_values()
-    if not current:
-        ws.update("A1:F1", [EXPECTED_HEADERS])
-        current = [EXPECTED_HEADERS]
-    else:
-        first = current[0] if current else []
-        if first != EXPECTED_HEADERS:
-            # Overwrite header row to match expected (avoids duplicates/blank header issues)
-            ws.update("A1:F1", [EXPECTED_HEADERS])
-
-    # Build existing keys (Date, Title) from sheet to avoid duplicates
-    values = ws.get_all_values()
-    existing_keys = set()
-    if len(values) > 1:
-        for row in values[1:]:
-            # pad row to at least 3 cols
-            row = (row + ["", "", ""])[:3]
-            k = (row[0], row[2])  # Date, Title
-            if any(k):
-                existing_keys.add(k)
-
-    # Prepare rows to append (in expected column order)
-    rows = []
+    index_path = SHEET_INDEX or index_path_for(DATA_OUT)
+    width = len(EXPECTED_HEADERS)
+    idx = load_index(index_path)
+    if idx is not None and not index_matches_sheet(ws, idx, width):
+        log.info("Sheet index out of date; rebuilding from the sheet")
+        idx = None
+
+    if idx is None:
+        # Full read only to (re)build the index; also fixes the header row
+        values = ws.get_all_values()
+        if not values or values[0] != EXPECTED_HEADERS:
+            ws.update(range_name="A1:F1", values=[EXPECTED_HEADERS])
+            values = [EXPECTED_HEADERS] + values[1:]
+        idx = build_index(values, sheet_row_key, width)
+
+    # Append rows (in expected column order) in chunks of SHEET_APPEND_ROWS
+    rows: List[List] = []
+    appended = 0
+
+    def flush():
+        nonlocal rows, appended
+        if rows:
+            ws.append_rows(rows, value_input_option="RAW")
+            idx["rows"] += len(rows)
+            idx["tail"] = row_fingerprint(rows[-1], width)
+            appended += len(rows)
+            rows = []
+
     for r in records:
-        key = (r.get("Date", ""), r.get("Title", ""))
-        if key in existing_keys:
+        k = key_hash(record_key(r))
+        if k in idx["keys"]:
             continue
+        idx["keys"].add(k)
         rows.append([r.get(h, "") for h in EXPECTED_HEADERS])
+        if len(rows) >= SHEET_APPEND_ROWS:
+            flush()
+    flush()
 
-    if rows:
-        ws.append_rows(rows, value_input_option="RAW")
-        log.info("Appended %d new rows to Google Sheet", len(rows))
+    if appended:
+        log.info("Appended %d new rows to Google Sheet", appended)
     else:
         log.info("No new rows to append to Google Sheet")
+    save_index(idx, index_path)
+
+def sheet_row_key(row: List[str]) -> str:
+    row = (row + [""] * len(EXPECTED_HEADERS))[:len(EXPECTED_HEADERS)]
+    return record_key(dict(zip(EXPECTED_HEADERS, row)))
+
+def index_matches_sheet(ws, idx: Dict, width: int) -> bool:
+    """
+    Cheap consistency check: the indexed last row is where we expect it and nothing follows it.
+    """
+    n = idx.get("rows", 0)
+    if n < 1:
+        return False
+    tail = ws.get(f"A{n}:F{n + 1}")
+    return len(tail) == 1 and row_fingerprint(tail[0], width) == idx.get("tail")
 
 # ==== Main ====
+def record_sort_key(r: Dict) -> Tuple[str, str, str, str]:
+    # Date asc, then Title asc; Type/URL break ties for a stable total order
+    return (r.get("Date", ""), r.get("Title", ""), r.get("Type", ""), r.get("Source URL", ""))
+
+def fetch_item(session: requests.Session, limiter: TokenBucket, doc_type: str, a: str, b: str,
+               expected: Optional[int] = None) -> List[Dict]:
+    """
+    Fetch one (type, window) work item; oversized windows are halved until they
+    fit, and windows that disagree with their facet total are re-fetched in
+    plain CHUNK_DAYS windows. Errors are logged and yield no records.
+    """
+    try:
+        with span("fetch", type=doc_type, window=f"{a}..{b}"):
+            records = fetch_window(session, a, b, doc_type, limiter, expected)
+        if records:
+            log.info("Fetched %d docs for %s..%s type=%s", len(records), a, b, doc_type)
+        # If truly no results for that day-range, it's fine.
+        return records
+    except FacetMismatch as e:
+        log.warning("Re-fetching %s..%s type=%s by date range: %s", a, b, doc_type, e)
+        return [r for x, y in daterange_chunks(parse_date(a), parse_date(b), CHUNK_DAYS)
+                for r in fetch_item(session, limiter, doc_type, x, y)]
+    except WindowTooLarge as e:
+        log.info("Splitting %s..%s type=%s (%d docs)", a, b, doc_type, e.count)
+        return [r for x, y in split_window(a, b) for r in fetch_item(session, limiter, doc_type, x, y)]
+    except requests.ReadTimeout:
+        log.warning("Read timeout for %s..%s type=%s", a, b, doc_type)
+    except requests.RequestException as e:
+        log.warning("RequestException for %s..%s type=%s: %s", a, b, doc_type, e)
+    return []
+
+def spill_item(session: requests.Session, limiter: TokenBucket, run_dir: str,
+               doc_type: str, a: str, b: str, expected: Optional[int] = None) -> Tuple[List[str], int]:
+    """
+    Streaming fetch_item(): records flow page by page into sorted NDJSON runs of
+    at most POLICY_RUN_ROWS records in run_dir. Returns (run paths, record count).
+    """
+    runs = RunWriter(run_dir, record_sort_key, POLICY_RUN_ROWS, prefix=f"{doc_type}-{a}-{b}")
+    n = 0
+    try:
+        with span("fetch", type=doc_type, window=f"{a}..{b}"):
+            for r in iter_window(session, a, b, doc_type, limiter, expected):
+                runs.add(r)
+                n += 1
+        if n:
+            log.info("Fetched %d docs for %s..%s type=%s", n, a, b, doc_type)
+    except (FacetMismatch, WindowTooLarge) as e:
+        if isinstance(e, FacetMismatch):
+            log.warning("Re-fetching %s..%s type=%s by date range: %s", a, b, doc_type, e)
+            windows = daterange_chunks(parse_date(a), parse_date(b), CHUNK_DAYS)
+        else:
+            log.info("Splitting %s..%s type=%s (%d docs)", a, b, doc_type, e.count)
+            windows = split_window(a, b)
+        parts = [spill_item(session, limiter, run_dir, doc_type, x, y) for x, y in windows]
+        return [p for paths, _ in parts for p in paths], sum(c for _, c in parts)
+    except requests.RequestException as e:
+        # Pages already received are kept; the next run's overlap re-fetches the rest
+        log.warning("RequestException for %s..%s type=%s after %d docs: %s", a, b, doc_type, n, e)
+    runs.flush()
+    return runs.paths, n
+
+def plan_type(session: requests.Session, limiter: TokenBucket, doc_type: str,
+              start_dt: datetime, end_dt: datetime) -> List[Tuple[str, str, Optional[int]]]:
+    """
+    Windows to fetch for one doc_type, with their expected document counts:
+    count-packed when daily counts are available, fixed CHUNK_DAYS chunks
+    (expected count None) otherwise.
+    """
+    counts = fetch_daily_counts(session, fmt_date(start_dt), fmt_date(end_dt), doc_type, limiter)
+    if counts is None:
+        return [(a, b, None) for a, b in daterange_chunks(start_dt, end_dt, CHUNK_DAYS)]
+    windows = pack_windows(counts, FR_PER_PAGE, fmt_date(start_dt), fmt_date(end_dt))
+    log.info("Planned %d windows for %d docs type=%s", len(windows), sum(counts.values()), doc_type)
+    return windows
+
+def resolve_start(store: PolicyStore) -> str:
+    """
+    Explicit START_DATE wins; otherwise resume from the store's last date minus the overlap.
+    """
+    if os.getenv("START_DATE"):
+        return START_DATE
+    last = store.last_publication_date()
+    if not last:
+        return START_DATE
+    return fmt_date(parse_date(last) - timedelta(days=POLICY_OVERLAP_DAYS))
+
 def main():
-    start_dt = parse_date(START_DATE)
+    """
+    Fetch, merge and write Policy_Events; returns the number of new or changed documents.
+    """
+    store = PolicyStore(POLICY_STORE, seed_paths=[os.path.splitext(DATA_OUT)[0], DATA_OUT])
+    start = resolve_start(store)
+    start_dt = parse_date(start)
     end_dt = parse_date(END_DATE)
     log.info(
-        "Policy tracker starting: %s .. %s types=%s chunk=%sd timeout=%ss retries=%s",
-        START_DATE, END_DATE, FR_TYPES, CHUNK_DAYS, REQUEST_TIMEOUT, MAX_RETRIES
+        "Policy tracker starting: %s .. %s (store=%d docs) types=%s chunk=%sd timeout=%ss retries=%s workers=%s rate=%s/s stream=%s",
+        start, END_DATE, len(store), FR_TYPES, CHUNK_DAYS, REQUEST_TIMEOUT, MAX_RETRIES, FR_WORKERS, FR_RATE_LIMIT,
+        POLICY_STREAM,
     )
 
-    session = build_session(timeout=REQUEST_TIMEOUT, max_retries=MAX_RETRIES)
+    # 429s are handled by the shared token bucket, not per-request urllib3 retries
+    session = build_session(
+        timeout=REQUEST_TIMEOUT, max_retries=MAX_RETRIES, pool_maxsize=FR_WORKERS,
+        cache=cache_from_env(), retry_statuses=(500, 502, 503, 504),
+    )
+    limiter = TokenBucket(FR_RATE_LIMIT)
+    run_dir = tempfile.mkdtemp(prefix="policy-runs-") if POLICY_STREAM else None
 
-    all_records: List[Dict] = []
-    chunks = daterange_chunks(start_dt, end_dt, CHUNK_DAYS)
-    for doc_type in FR_TYPES:
-        for a, b in chunks:
+    try:
+        with ThreadPoolExecutor(max_workers=FR_WORKERS) as pool:
+            plans = list(pool.map(lambda t: plan_type(session, limiter, t, start_dt, end_dt), FR_TYPES))
+            work = [(doc_type, a, b, n) for doc_type, windows in zip(FR_TYPES, plans) for a, b, n in windows]
+            if run_dir:
+                spilled = list(pool.map(lambda item: spill_item(session, limiter, run_dir, *item), work))
+            else:
+                results = list(pool.map(lambda item: fetch_item(session, limiter, *item), work))
+
+        if run_dir:
+            # External merge of the sorted runs; re-read from disk for each pass
+            paths = [p for run_paths, _ in spilled for p in run_paths]
+            n_fetched = sum(n for _, n in spilled)
+            def fetched():
+                return dedup_sorted(merge_runs(paths, record_sort_key), record_key, lambda r: r.get("Date", ""))
+        else:
+            # Concatenate in work-item order, then sort with a total key so output is
+            # identical regardless of which window finished first.
+            records: List[Dict] = [r for batch in results for r in batch]
+            records.sort(key=record_sort_key)
+            n_fetched = len(records)
+            def fetched():
+                return records
+
+        # Merge into the store and regenerate the full output from it
+        with span("store_write"):
+            added, changed = store.merge(fetched())
+        log.info("Store: %d fetched, %d new, %d changed, %d total", n_fetched, added, changed, len(store))
+        write_json(store.iter_sorted(), DATA_OUT)
+        log.info("Wrote %d total records for %s", len(store), DATA_OUT)
+        if SEARCH_INDEX.lower() != "none" and (added or changed or not os.path.exists(SEARCH_INDEX)):
+            with span("json_write", path=SEARCH_INDEX):
+                n = store.export_index(SEARCH_INDEX)
+            log.info("Wrote search index for %d documents to %s", n, SEARCH_INDEX)
+
+        # Optional Google Sheets sync
+        if GOOGLE_CREDENTIALS and GOOGLE_SHEET_ID:
             try:
-                records = fetch_window(session, a, b, doc_type)
-                if records:
-                    all_records.extend(records)
-                    log.info("Fetched %d docs for %s..%s type=%s", len(records), a, b, doc_type)
-                else:
-                    # If truly no results for that day-range, it's fine; just note it.
-                    # We don't recursively split below 1 day to avoid API hammering.
-                    # The earlier error you saw ("No results and cannot split further") was benign info.
-                    pass
-            except requests.ReadTimeout:
-                log.warning("Read timeout for %s..%s type=%s", a, b, doc_type)
-            except requests.RequestException as e:
-                log.warning("RequestException for %s..%s type=%s: %s", a, b, doc_type, e)
-
-    # Sort & write
-    # Sort by Date desc then Title asc for stability
-    all_records.sort(key=lambda r: (r.get("Date", ""), r.get("Title", "")))
-    write_json(all_records, DATA_OUT)
-    log.info("Wrote %d total records to %s", len(all_records), DATA_OUT)
-
-    # Optional Google Sheets sync
-    if GOOGLE_CREDENTIALS and GOOGLE_SHEET_ID:
-        try:
-            sync_google_sheet(all_records, GOOGLE_SHEET_ID, GOOGLE_CREDENTIALS)
-        except Exception as e:
-            # Don't fail the entire job just because Sheet sync had a shape/header issue
-            log.error("Google Sheets sync failed: %s", e)
-            # Re-raise if you want the CI to fail here:
-            # raise
+                with span("sheet_write", tab="Policy_Events"):
+                    sync_google_sheet(fetched(), GOOGLE_SHEET_ID, GOOGLE_CREDENTIALS)
+            except Exception as e:
+                # Don't fail the entire job just because Sheet sync had a shape/header issue
+                log.error("Google Sheets sync failed: %s", e)
+                # Re-raise if you want the CI to fail here:
+                # raise
+    finally:
+        store.close()
+        if run_dir:
+            shutil.rmtree(run_dir, ignore_errors=True)
+    return added + changed
 
 if __name__ == "__main__":
     try:
-        main()
+        with run_report("policy_tracker"):
+            main()
     except Exception as e:
         log.exception("Fatal error")
         sys.exit(1)
@@ -1,81 +1,210 @@
-
-import os
 import json
-import requests
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from bs4 import BeautifulSoup
-import gspread
-from google.oauth2.service_account import Credentials
+from http_cache import cache_from_env
+from http_session import build_session
 from log_update_notes import log_update
+from series_store import open_store
+from sheets_mirror import bootstrap, mirror
+from telemetry import run_report, span
+
+# 'change' appends a row only when the price differs from the last stored one
+# (snapshot_to_json.py rolls prices forward day by day at export time);
+# 'daily' appends a row every day as before.
+PRICE_STORAGE = os.getenv("PRICE_STORAGE", "change")
+
+# Prices are recorded in the local series store (series_store.py), which is
+# seeded from the sheet the first time a tab is seen and mirrored back to it
+# afterwards (sheets_mirror.py); the last-price check never reads the sheet.
+DEFAULT_HEADER = ["Date", "Price (USD)"]
 
-# Google Sheets authentication using GitHub Secrets
-scopes = [
-    "https://www.googleapis.com/auth/spreadsheets",
-    "https://www.googleapis.com/auth/drive"
+SCRAPER_WORKERS = int(os.getenv("SCRAPER_WORKERS", "8"))
+REQUEST_TIMEOUT = int(os.getenv("REQUEST_TIMEOUT", "20"))
+MAX_RETRIES = int(os.getenv("MAX_RETRIES", "3"))
+
+# Scrape targets: one entry per tracked product.
+#   pattern   regex whose first group is the price text; searched once over the
+#             raw HTML and stops at the first match (no DOM is built)
+#   selector  optional (tag, class[, child tag]) fallback parsed with BeautifulSoup
+#   parse     price parser for the matched text (default: parse_price)
+# Each target has a saved page in SCRAPE_FIXTURES (<name>.html) and its price
+# in expected.json there; `python price_scraper.py --check-fixtures` fails if
+# a pattern no longer finds that price.
+SCRAPE_TARGETS = [
+    {
+        "name": "iphone",
+        "tab": "iPhone_Prices",
+        "url": "https://www.apple.com/shop/buy-iphone/iphone-15",
+        "pattern": r'<span[^>]*class="[^"]*\bas-price-currentprice\b[^"]*"[^>]*>\s*(?:<[^>]+>\s*)*([^<]+)',
+        "selector": ("span", "as-price-currentprice"),
+        "note": "Rolled forward or updated base model price",
+    },
+    {
+        "name": "rav4",
+        "tab": "Car_Prices",
+        "url": "https://www.edmunds.com/toyota/rav4/2024/xle/",
+        "pattern": r'class="[^"]*\boverview-cost__pricing-summary\b[^"]*"[^>]*>[\s\S]{0,2000}?<span[^>]*>\s*([^<]+)',
+        "selector": ("div", "overview-cost__pricing-summary", "span"),
+        "note": "Rolled forward or updated Toyota RAV4 MSRP",
+    },
 ]
-creds_dict = json.loads(os.environ["GOOGLE_CREDENTIALS"])
-credentials = Credentials.from_service_account_info(creds_dict, scopes=scopes)
-gc = gspread.authorize(credentials)
-
-# Open the Google Sheet using its unique ID
-sheet = gc.open_by_key(os.environ["GOOGLE_SHEET_ID"])
-
-def get_current_iphone_price():
-    url = "https://www.apple.com/shop/buy-iphone/iphone-15"
-    headers = {"User-Agent": "Mozilla/5.0"}
-    res = requests.get(url, headers=headers)
-    soup = BeautifulSoup(res.text, "html.parser")
-    try:
-        price_tag = soup.find("span", class_="as-price-currentprice")
-        price_text = price_tag.get_text().strip()
-        price = float(price_text.replace("$", "").replace(",", ""))
-        return price
-    except Exception:
-        return None
 
-def get_current_rav4_price():
-    url = "https://www.edmunds.com/toyota/rav4/2024/xle/"
-    headers = {"User-Agent": "Mozilla/5.0"}
-    res = requests.get(url, headers=headers)
-    soup = BeautifulSoup(res.text, "html.parser")
+SCRAPE_FIXTURES = os.getenv("SCRAPE_FIXTURES", "fixtures/scrape")
+
+_PRICE_RE = re.compile(r"\$?\s*(\d[\d,]*(?:\.\d+)?)")
+_compiled = {}
+
+def compiled_pattern(target):
+    rx = _compiled.get(target["name"])
+    if rx is None:
+        rx = _compiled[target["name"]] = re.compile(target["pattern"])
+    return rx
+
+def extract_price(target, html):
+    """
+    Price for `target` from a page's HTML, or None. Pure function, so targets
+    can be checked against saved pages:
+
+      python price_scraper.py --check NAME FILE   print the price found in FILE
+                                                  (pattern, then selector fallback)
+      python price_scraper.py --check-fixtures    check every pattern against its
+                                                  saved page in SCRAPE_FIXTURES; the
+                                                  gate the workflows run
+    """
+    parse = target.get("parse", parse_price)
+    m = compiled_pattern(target).search(html)
+    if m:
+        price = parse(m.group(1).strip())
+        if price:
+            return price
+    if target.get("selector"):
+        from bs4 import BeautifulSoup  # slow path, only when the pattern misses
+        tag, cls, *child = target["selector"]
+        node = BeautifulSoup(html, "html.parser").find(tag, class_=cls)
+        if node is not None and child:
+            node = node.find(child[0])
+        if node is not None:
+            return parse(node.get_text().strip())
+    return None
+
+def fetch_price(session, target):
     try:
-        price_tag = soup.find("div", class_="overview-cost__pricing-summary").find("span")
-        price_text = price_tag.get_text().strip()
-        price = float(price_text.replace("$", "").replace(",", ""))
-        return price
-    except Exception:
+        with span("fetch", target=target["name"]):
+            res = session.get(target["url"])
+            res.raise_for_status()
+        with span("parse", target=target["name"]):
+            return extract_price(target, res.text)
+    except Exception as e:
+        print(f"❌ Failed to scrape {target['name']}: {e}")
         return None
 
-def update_price_sheet(sheet_name, current_price):
-    ws = sheet.worksheet(sheet_name)
-    records = ws.get_all_values()
-    today = datetime.today().strftime("%Y-%m-%d")
-    if records and records[-1][1] == str(current_price):
-        ws.append_row([today, current_price])
-    elif not records or records[-1][1] != str(current_price):
-        ws.append_row([today, current_price])
+def scrape_all(targets=None):
+    """
+    Fetch every target concurrently over one pooled session. The shared HTTP
+    cache sends If-None-Match/If-Modified-Since, so unchanged pages cost a 304.
+    Returns {target name: price or None}.
+    """
+    targets = SCRAPE_TARGETS if targets is None else targets
+    session = build_session(timeout=REQUEST_TIMEOUT, max_retries=MAX_RETRIES,
+                            pool_maxsize=SCRAPER_WORKERS, cache=cache_from_env())
+    session.headers["User-Agent"] = "Mozilla/5.0"
+    with ThreadPoolExecutor(max_workers=max(1, min(SCRAPER_WORKERS, len(targets) or 1))) as pool:
+        prices = list(pool.map(lambda t: fetch_price(session, t), targets))
+    return {t["name"]: p for t, p in zip(targets, prices)}
+
+def parse_price(value):
+    """'$28,500', 'From $799.00' or 849 -> float; None if there is no number."""
+    m = _PRICE_RE.search(str(value))
+    return float(m.group(1).replace(",", "")) if m else None
+
+def row_price(row):
+    # Price is the last filled column (Date, ..., Price)
+    for cell in reversed(row):
+        if cell not in ("", None):
+            return parse_price(cell)
+    return None
+
+def record_price(tab, current_price, store=None):
+    """
+    Record today's price; in 'change' mode only when it differs from the last row.
+    New rows copy the last row's other columns (Model, Trim, ...). Returns rows written.
+    """
+    store = store or open_store()
+    bootstrap(tab, store)
+    last = store.last(tab) or []
+    if PRICE_STORAGE == "change" and last and row_price(last) == float(current_price):
+        return 0
+    # UTC, like the rollover in snapshot_to_json.expand_rollover
+    today = datetime.utcnow().strftime("%Y-%m-%d")
+    new_row = list(last) if len(last) > 2 else [today, current_price]
+    new_row[0] = today
+    new_row[-1] = current_price
+    with span("store_write", tab=tab):
+        updated, inserted = store.upsert(tab, store.header(tab) or DEFAULT_HEADER, [new_row])
+    return updated + inserted
 
 def main():
-    iphone_price = get_current_iphone_price()
-    if iphone_price:
-        update_price_sheet("iPhone_Prices", iphone_price)
+    """
+    Scrape every target and record prices; returns the tabs that were rolled
+    forward or updated (their rolled-over exports change even without a new row).
+    """
+    store = open_store()
+    prices = scrape_all()
+    changed = []
+    for target in SCRAPE_TARGETS:
+        price = prices.get(target["name"])
+        if not price:
+            continue
+        changed.append(target["tab"])
+        written = record_price(target["tab"], price, store)
         log_update(
-            tab_name="iPhone_Prices",
-            row_count=1,
+            tab_name=target["tab"],
+            row_count=written,
             update_type="price_scrape",
-            note="Rolled forward or updated base model price",
-            source_url="https://www.apple.com/shop/buy-iphone/iphone-15"
+            note=target["note"],
+            source_url=target["url"]
         )
+    return changed
 
-    rav4_price = get_current_rav4_price()
-    if rav4_price:
-        update_price_sheet("Car_Prices", rav4_price)
-        log_update(
-            tab_name="Car_Prices",
-            row_count=1,
-            update_type="price_scrape",
-            note="Rolled forward or updated Toyota RAV4 MSRP",
-            source_url="https://www.edmunds.com/toyota/rav4/2024/xle/"
-        )
+def check_fixture(name, path):
+    target = next(t for t in SCRAPE_TARGETS if t["name"] == name)
+    with open(path, encoding="utf-8", errors="replace") as f:
+        print(extract_price(target, f.read()))
+
+def check_fixtures(directory=SCRAPE_FIXTURES):
+    """
+    Run every target's pattern (not the BeautifulSoup fallback) over its saved
+    page and compare with the expected price; returns the names that failed.
+    """
+    with open(os.path.join(directory, "expected.json"), encoding="utf-8") as f:
+        expected = json.load(f)
+    failed = []
+    for target in SCRAPE_TARGETS:
+        name = target["name"]
+        path = os.path.join(directory, f"{name}.html")
+        if not os.path.exists(path) or name not in expected:
+            print(f"❌ {name}: no saved page or expected price in {directory}")
+            failed.append(name)
+            continue
+        with open(path, encoding="utf-8", errors="replace") as f:
+            m = compiled_pattern(target).search(f.read())
+        price = target.get("parse", parse_price)(m.group(1).strip()) if m else None
+        if price != expected[name]:
+            print(f"❌ {name}: pattern found {price}, expected {expected[name]}")
+            failed.append(name)
+        else:
+            print(f"✅ {name}: {price}")
+    return failed
 
-main()
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--check":
+        check_fixture(sys.argv[2], sys.argv[3])
+    elif sys.argv[1:] == ["--check-fixtures"]:
+        sys.exit(1 if check_fixtures() else 0)
+    else:
+        with run_report("price_scraper"):
+            main()
+            mirror()
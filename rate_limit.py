@@ -0,0 +1,76 @@
+"""
+Thread-safe token-bucket rate limiter shared by concurrent fetch workers.
+
+Workers call acquire() before each request. When an API answers 429, the
+caller reports it with backoff(); every worker then pauses until the
+Retry-After deadline (or an exponential fallback) has passed.
+"""
+
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import requests
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        rate: tokens added per second; capacity: burst size (default: max(1, rate)).
+        """
+        self.rate = max(float(rate), 0.001)
+        self.capacity = float(capacity) if capacity else max(1.0, self.rate)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if now >= self._blocked_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = max(self._blocked_until - now, (1 - self._tokens) / self.rate)
+            time.sleep(wait)
+
+    def backoff(self, seconds: float):
+        """Pause all callers for `seconds` and drain the burst allowance."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+
+def retry_after_seconds(resp: requests.Response, default: float) -> float:
+    """
+    Parse a Retry-After header (delta-seconds or HTTP date); fall back to `default`.
+    """
+    value = resp.headers.get("Retry-After")
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return default
+
+def limited_get(session: requests.Session, bucket: TokenBucket, url: str,
+                max_retries: int = 5, **kwargs) -> requests.Response:
+    """
+    session.get() gated by the bucket; 429 responses back off the whole bucket and retry.
+    """
+    attempt = 0
+    while True:
+        bucket.acquire()
+        resp = session.get(url, **kwargs)
+        if resp.status_code != 429 or attempt >= max_retries:
+            return resp
+        bucket.backoff(retry_after_seconds(resp, 0.8 * (2 ** attempt)))
+        attempt += 1
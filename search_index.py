@@ -0,0 +1,152 @@
+"""
+Prebuilt inverted index and facets for the policy events.
+
+The index lives in the policy store's SQLite file next to the documents and is
+maintained per document as records are merged (see policy_store.py), so a run
+only tokenizes the documents it added or changed:
+
+  postings (term, key)     one row per distinct title/abstract term of a document
+  agencies (key, agency)   the document's agencies ('Unknown' when none)
+
+export() writes it to the compact file the dashboard loads, where documents
+are numbered by their position in the published (date) order:
+
+  {"format": "policy-search", "version": 1, "total": n,
+   "stopwords": [...],
+   "docs": {"id": [document_number, ...], "date": [...]},
+   "terms": {term: [gap, gap, ...]},
+   "facets": {"agency": {name: {"count": c, "docs": [gap, ...], "months": {"2025-10": c}}},
+              "type":   {...}},
+   "months": {"2025-10": c, ...}}
+
+Posting lists are ascending positions stored as gaps from the previous one (the
+first relative to 0), so keyword and agency filtering over the whole history
+is a lookup and a merge of sorted lists rather than a scan of every record.
+"""
+
+import io
+import json
+import re
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+from fileio import write_if_changed
+
+FORMAT = "policy-search"
+VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS postings (
+    term    TEXT NOT NULL,
+    key     TEXT NOT NULL,
+    PRIMARY KEY (term, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_key ON postings (key);
+CREATE TABLE IF NOT EXISTS agencies (
+    key     TEXT NOT NULL,
+    agency  TEXT NOT NULL,
+    PRIMARY KEY (key, agency)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS agencies_agency ON agencies (agency);
+"""
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in into is it its of on or that the
+their this to was were which will with
+""".split())
+
+
+def tokenize(text: str) -> Set[str]:
+    """Distinct lowercase alphanumeric terms of at least two characters, minus stopwords."""
+    return {t for t in _TOKEN_RE.findall((text or "").lower()) if len(t) > 1 and t not in STOPWORDS}
+
+def record_terms(record: Dict) -> Set[str]:
+    return tokenize(record.get("Title", "")) | tokenize(record.get("Description", ""))
+
+def record_agencies(record: Dict) -> List[str]:
+    """
+    The record's agency list; records written before 'Agencies' was kept fall
+    back to splitting the joined 'Agency' string.
+    """
+    names = record.get("Agencies")
+    if names is None:
+        names = [a.strip() for a in (record.get("Agency") or "").split(", ")]
+    return [a for a in names if a] or ["Unknown"]
+
+def index_document(db, key: str, record: Dict):
+    """(Re)index one document; call inside the transaction that stores it."""
+    db.execute("DELETE FROM postings WHERE key = ?", (key,))
+    db.execute("DELETE FROM agencies WHERE key = ?", (key,))
+    db.executemany("INSERT INTO postings (term, key) VALUES (?, ?)", ((t, key) for t in sorted(record_terms(record))))
+    db.executemany("INSERT OR IGNORE INTO agencies (key, agency) VALUES (?, ?)",
+                   ((key, a) for a in record_agencies(record)))
+
+def unindexed(db) -> Iterator[Tuple[str, str]]:
+    """(key, record JSON) of stored documents the index doesn't cover yet."""
+    return db.execute(
+        "SELECT key, record FROM documents WHERE key NOT IN (SELECT DISTINCT key FROM agencies)"
+    )
+
+def _gaps(positions: Iterable[int]) -> List[int]:
+    out, prev = [], 0
+    for p in sorted(positions):
+        out.append(p - prev)
+        prev = p
+    return out
+
+def _facet(db, sql: str, pos: Dict[str, int]) -> Dict[str, Dict]:
+    """{name: {count, docs, months}} from rows of (name, key, month)."""
+    facets: Dict[str, Dict] = {}
+    for name, key, month in db.execute(sql):
+        f = facets.setdefault(name, {"count": 0, "docs": [], "months": {}})
+        f["count"] += 1
+        f["docs"].append(pos[key])
+        f["months"][month] = f["months"].get(month, 0) + 1
+    for f in facets.values():
+        f["docs"] = _gaps(f["docs"])
+    return facets
+
+def export(db, path: str) -> int:
+    """
+    Write the index for every stored document to `path`. Postings are read
+    term by term, but the document is assembled in memory so it can be
+    compared with the current file: it is replaced atomically, and only if
+    its content changed. Returns the number of documents indexed.
+    """
+    ids: List[str] = []
+    dates: List[str] = []
+    pos: Dict[str, int] = {}
+    months: Dict[str, int] = {}
+    for key, day in db.execute("SELECT key, date FROM documents ORDER BY date, title, type, url"):
+        pos[key] = len(ids)
+        ids.append(key)
+        dates.append(day)
+        months[day[:7]] = months.get(day[:7], 0) + 1
+
+    facets = {
+        "agency": _facet(db, "SELECT a.agency, a.key, substr(d.date, 1, 7) FROM agencies a "
+                             "JOIN documents d ON d.key = a.key ORDER BY a.agency", pos),
+        "type": _facet(db, "SELECT type, key, substr(date, 1, 7) FROM documents ORDER BY type", pos),
+    }
+
+    def dumps(obj) -> str:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+    with io.StringIO() as f:
+        f.write(f'{{"format":{dumps(FORMAT)},"version":{VERSION},"total":{len(ids)},')
+        f.write(f'"stopwords":{dumps(sorted(STOPWORDS))},')
+        f.write(f'"docs":{dumps({"id": ids, "date": dates})},"terms":{{')
+        term, keys, first = None, [], True
+        for t, key in db.execute("SELECT term, key FROM postings ORDER BY term"):
+            if t != term:
+                if term is not None:
+                    f.write(("" if first else ",") + f"{dumps(term)}:{dumps(_gaps(pos[k] for k in keys))}")
+                    first = False
+                term, keys = t, []
+            keys.append(key)
+        if term is not None:
+            f.write(("" if first else ",") + f"{dumps(term)}:{dumps(_gaps(pos[k] for k in keys))}")
+        f.write(f'}},"facets":{dumps(facets)},"months":{dumps(dict(sorted(months.items())))}}}')
+        write_if_changed(path, f.getvalue().encode("utf-8"))
+    return len(ids)
@@ -0,0 +1,130 @@
+"""
+Declarative registry of the tracked series: one entry per sheet tab.
+
+Every consumer derives its lists from here instead of keeping its own:
+
+  data_updater.py             fetches every 'fred' entry (series_id, header)
+  snapshot_to_json.py         exports every tab and builds the dashboard bundle
+                              from the entries with a 'label'
+  update_metadata_entries.py  keeps the Metadata tab in step with the registry
+  add_metadata_tab.py         recreates the Metadata tab from scratch
+
+Adding a FRED series is one entry below; its fetch, store, Sheets mirror
+(one batched write for all tabs, see sheets_mirror.py), export and metadata
+row follow from it.
+
+Entry keys:
+  tab          sheet tab / local store table / docs/data/<tab>.json
+  source       'fred' (fetched by data_updater.py) or 'scrape' (price_scraper.py)
+  series_id    FRED series id ('fred' only)
+  header       tab header row ('fred' only; scraped tabs keep the sheet's header)
+  label        dashboard/bundle label (optional; must match SERIES in docs/dashboard.js)
+  value_keys   value columns in order of preference, for the bundle
+  description, provider, units, details, source_url
+               the Metadata tab row
+  note         Update_Notes entry for each refresh
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+METADATA_TAB = "Metadata"
+METADATA_HEADER = ["Sheet Name", "Description", "Source", "Units", "Notes", "Link"]
+
+SERIES: List[Dict] = [
+    {
+        "tab": "Egg_Prices",
+        "source": "fred",
+        "series_id": "APU0000708111",
+        "header": ["Date", "Price (USD per dozen)"],
+        "label": "Eggs",
+        "value_keys": ["Price (USD per dozen)", "Price (USD)"],
+        "description": "Avg price of Grade A large eggs (U.S. city avg)",
+        "provider": "FRED/BLS",
+        "units": "USD per dozen",
+        "details": "Series APU0000708111",
+        "source_url": "https://fred.stlouisfed.org/series/APU0000708111",
+        "note": "FRED data refreshed from Jan 2021",
+    },
+    {
+        # original source: EIA
+        "tab": "Gas_Prices",
+        "source": "fred",
+        "series_id": "GASREGW",
+        "header": ["Date", "Price (USD per gallon)"],
+        "label": "Gas",
+        "value_keys": ["Price (USD per gallon)", "Price (USD)"],
+        "description": "Regular gasoline price, all formulations (U.S. avg)",
+        "provider": "FRED/EIA",
+        "units": "USD per gallon",
+        "details": "Series GASREGW (weekly)",
+        "source_url": "https://fred.stlouisfed.org/series/GASREGW",
+        "note": "FRED gas price data (weekly) refreshed from Jan 2021",
+    },
+    {
+        "tab": "iPhone_Prices",
+        "source": "scrape",
+        "label": "iPhone",
+        "value_keys": ["Price (USD)"],
+        "description": "MSRP of base model iPhone with 128GB storage",
+        "provider": "Apple",
+        "units": "USD",
+        "details": "Daily scrape from Apple.com with rollover if unchanged",
+        "source_url": "https://www.apple.com/iphone/",
+    },
+    {
+        "tab": "Car_Prices",
+        "source": "scrape",
+        "label": "RAV4",
+        "value_keys": ["Price (USD)"],
+        "description": "MSRP of Toyota RAV4 XLE by model year",
+        "provider": "Toyota",
+        "units": "USD",
+        "details": "Annual MSRP tracked daily with rollover; pulled from pressroom releases",
+        "source_url": "https://pressroom.toyota.com/releases/",
+    },
+    {
+        "tab": "Interest_Rates",
+        "source": "fred",
+        "series_id": "DGS10",
+        "header": ["Date", "10-Year Treasury Rate (%)"],
+        "label": "10Y Treasury (%)",
+        "value_keys": ["10-Year Treasury Rate (%)", "Rate (%)"],
+        "description": "10-Year Treasury constant maturity rate",
+        "provider": "FRED",
+        "units": "Percent",
+        "details": "Series DGS10",
+        "source_url": "https://fred.stlouisfed.org/series/DGS10",
+        "note": "FRED interest rate data refreshed from Jan 2021",
+    },
+    {
+        "tab": "Stock_Market",
+        "source": "fred",
+        "series_id": "SP500",
+        "header": ["Date", "S&P 500 Index"],
+        "label": "S&P 500",
+        "value_keys": ["S&P 500 Index", "Close"],
+        "description": "S&P 500 Index daily close",
+        "provider": "FRED",
+        "units": "Index level",
+        "details": "Series SP500",
+        "source_url": "https://fred.stlouisfed.org/series/SP500",
+        "note": "FRED S&P 500 data refreshed from Jan 2021",
+    },
+]
+
+
+def fred_series() -> List[Dict]:
+    return [s for s in SERIES if s["source"] == "fred"]
+
+def tabs(source: Optional[str] = None) -> List[str]:
+    """Tabs of all series, or of those from one source ('fred' or 'scrape')."""
+    return [s["tab"] for s in SERIES if source in (None, s["source"])]
+
+def bundle_series() -> Dict[str, Tuple[str, List[str]]]:
+    """Dashboard bundle series: label -> (tab, value columns in order of preference)."""
+    return {s["label"]: (s["tab"], s["value_keys"]) for s in SERIES if s.get("label")}
+
+def metadata_rows() -> List[List[str]]:
+    """Metadata tab rows (without the header), one per series."""
+    return [[s["tab"], s["description"], s["provider"], s["units"], s["details"], s["source_url"]]
+            for s in SERIES]
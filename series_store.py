@@ -0,0 +1,233 @@
+"""
+Local time-series store: the source of truth for the FRED and price tabs.
+
+A single SQLite file (default 'state/series.db') holds, per tab, the header row
+and one row per date keyed by (tab, date), so date-range reads are index scans:
+
+  tabs    (tab PRIMARY KEY, header)             header is a JSON list
+  rows    (tab, date, cells, PRIMARY KEY(tab, date))  cells is the full JSON row
+  mirror  (tab PRIMARY KEY, rows, dirty_from)   Google Sheets mirror state
+  versions (tab PRIMARY KEY, version)           bumped on every content change
+
+Fetchers upsert rows here and the JSON export reads from here, so neither
+depends on Sheets latency or quota. Cells keep their Python types (no
+re-inference from sheet strings). Every write records the earliest changed
+date in `mirror.dirty_from`; sheets_mirror.py later pushes only that tail to
+the sheet ('' means the tab must be rewritten in full) and marks it clean.
+The per-tab version lets exports skip tabs that haven't changed since they
+were last written (see snapshot_to_json.py).
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+DB_PATH = os.getenv("SERIES_DB_PATH", "state/series.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tabs (
+    tab     TEXT PRIMARY KEY,
+    header  TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rows (
+    tab     TEXT NOT NULL,
+    date    TEXT NOT NULL,
+    cells   TEXT NOT NULL,
+    PRIMARY KEY (tab, date)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS mirror (
+    tab         TEXT PRIMARY KEY,
+    rows        INTEGER,
+    dirty_from  TEXT
+);
+CREATE TABLE IF NOT EXISTS versions (
+    tab         TEXT PRIMARY KEY,
+    version     INTEGER NOT NULL
+);
+"""
+
+Row = List
+
+
+def _dump(row: Row) -> str:
+    return json.dumps(row, separators=(",", ":"), ensure_ascii=False)
+
+
+class SeriesStore:
+    """
+    Thread-safe handle on the store; each thread gets its own connection
+    (pipeline stages write concurrently; SQLite serializes the writers).
+    """
+
+    def __init__(self, path: str = DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn().executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            # Default rollback journal rather than WAL: the .db file is committed
+            # by the workflows and must be complete without a -wal sidecar.
+            db = self._local.db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        return db
+
+    @contextmanager
+    def _tx(self) -> Iterator[sqlite3.Connection]:
+        db = self._conn()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            yield db
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        db.execute("COMMIT")
+
+    def close(self):
+        db = getattr(self._local, "db", None)
+        if db is not None:
+            db.close()
+            self._local.db = None
+
+    # ---- reads ----
+    def has(self, tab: str) -> bool:
+        return self._conn().execute("SELECT 1 FROM tabs WHERE tab = ?", (tab,)).fetchone() is not None
+
+    def tabs(self) -> List[str]:
+        return [r[0] for r in self._conn().execute("SELECT tab FROM tabs ORDER BY tab")]
+
+    def header(self, tab: str) -> Optional[List[str]]:
+        r = self._conn().execute("SELECT header FROM tabs WHERE tab = ?", (tab,)).fetchone()
+        return json.loads(r[0]) if r else None
+
+    def rows(self, tab: str, start: Optional[str] = None, end: Optional[str] = None) -> List[Row]:
+        """Rows of `tab` with start <= date <= end (either bound optional), by date."""
+        sql, args = "SELECT cells FROM rows WHERE tab = ?", [tab]
+        if start:
+            sql += " AND date >= ?"
+            args.append(start)
+        if end:
+            sql += " AND date <= ?"
+            args.append(end)
+        return [json.loads(r[0]) for r in self._conn().execute(sql + " ORDER BY date", args)]
+
+    def records(self, tab: str, start: Optional[str] = None, end: Optional[str] = None) -> List[Dict]:
+        """Rows as dicts keyed by the tab's header (the shape get_all_records returns)."""
+        header = self.header(tab) or []
+        pad = [""] * len(header)
+        return [dict(zip(header, row + pad[len(row):])) for row in self.rows(tab, start, end)]
+
+    def count(self, tab: str, before: Optional[str] = None) -> int:
+        sql, args = "SELECT COUNT(*) FROM rows WHERE tab = ?", [tab]
+        if before is not None:
+            sql += " AND date < ?"
+            args.append(before)
+        return self._conn().execute(sql, args).fetchone()[0]
+
+    def last(self, tab: str) -> Optional[Row]:
+        r = self._conn().execute(
+            "SELECT cells FROM rows WHERE tab = ? ORDER BY date DESC LIMIT 1", (tab,)).fetchone()
+        return json.loads(r[0]) if r else None
+
+    def version(self, tab: str) -> int:
+        """Content version of `tab`: changes whenever its header or rows do (0 if never written)."""
+        r = self._conn().execute("SELECT version FROM versions WHERE tab = ?", (tab,)).fetchone()
+        return r[0] if r else 0
+
+    def last_date(self, tab: str) -> Optional[str]:
+        r = self._conn().execute("SELECT MAX(date) FROM rows WHERE tab = ?", (tab,)).fetchone()
+        return r[0] if r else None
+
+    # ---- writes ----
+    def upsert(self, tab: str, header: List[str], rows: List[Row]) -> Tuple[int, int]:
+        """
+        Insert new dates and replace changed rows (rows are [date, ...cells]).
+        Unchanged rows are not touched. Returns (updated, inserted).
+        """
+        updated = inserted = 0
+        new = {str(row[0]): _dump(row) for row in rows}
+        with self._tx() as db:
+            self._set_header(db, tab, header)
+            # One range read instead of a lookup per row
+            old = dict(db.execute("SELECT date, cells FROM rows WHERE tab = ? AND date BETWEEN ? AND ?",
+                                  (tab, min(new), max(new)))) if new else {}
+            changed = [(tab, d, cells) for d, cells in new.items() if old.get(d) != cells]
+            db.executemany("INSERT OR REPLACE INTO rows (tab, date, cells) VALUES (?, ?, ?)", changed)
+            updated = sum(1 for _, d, _ in changed if d in old)
+            inserted = len(changed) - updated
+            if changed:
+                self._mark_dirty(db, tab, min(d for _, d, _ in changed))
+        return updated, inserted
+
+    def replace(self, tab: str, header: List[str], rows: List[Row], mirrored: bool = False):
+        """
+        Replace all of `tab`'s rows (duplicate dates keep the last row). With
+        mirrored=True the sheet is known to hold exactly these rows already.
+        """
+        with self._tx() as db:
+            self._set_header(db, tab, header)
+            db.execute("DELETE FROM rows WHERE tab = ?", (tab,))
+            db.executemany("INSERT OR REPLACE INTO rows (tab, date, cells) VALUES (?, ?, ?)",
+                           ((tab, str(r[0]), _dump(r)) for r in rows))
+            n = db.execute("SELECT COUNT(*) FROM rows WHERE tab = ?", (tab,)).fetchone()[0]
+            clean = mirrored and n == len(rows)
+            db.execute("INSERT OR REPLACE INTO mirror (tab, rows, dirty_from) VALUES (?, ?, ?)",
+                       (tab, n if clean else None, None if clean else ""))
+            self._bump(db, tab)
+
+    def _set_header(self, db: sqlite3.Connection, tab: str, header: List[str]):
+        old = db.execute("SELECT header FROM tabs WHERE tab = ?", (tab,)).fetchone()
+        new = _dump(list(header))
+        if old is None or old[0] != new:
+            db.execute("INSERT OR REPLACE INTO tabs (tab, header) VALUES (?, ?)", (tab, new))
+            if old is not None:
+                self._mark_dirty(db, tab, "")
+
+    def _bump(self, db: sqlite3.Connection, tab: str):
+        db.execute("INSERT INTO versions (tab, version) VALUES (?, 1) "
+                   "ON CONFLICT(tab) DO UPDATE SET version = version + 1", (tab,))
+
+    def _mark_dirty(self, db: sqlite3.Connection, tab: str, date: str):
+        self._bump(db, tab)
+        r = db.execute("SELECT rows, dirty_from FROM mirror WHERE tab = ?", (tab,)).fetchone()
+        if r is None:
+            db.execute("INSERT INTO mirror (tab, rows, dirty_from) VALUES (?, NULL, '')", (tab,))
+        elif r[1] is None or date < r[1]:
+            db.execute("UPDATE mirror SET dirty_from = ? WHERE tab = ?", (date, tab))
+
+    # ---- Sheets mirror state ----
+    def dirty_tabs(self) -> List[str]:
+        return [r[0] for r in self._conn().execute(
+            "SELECT tab FROM mirror WHERE dirty_from IS NOT NULL ORDER BY tab")]
+
+    def mirror_state(self, tab: str) -> Tuple[Optional[int], Optional[str]]:
+        """(rows currently in the sheet or None if unknown, earliest unsynced date or None)."""
+        r = self._conn().execute("SELECT rows, dirty_from FROM mirror WHERE tab = ?", (tab,)).fetchone()
+        return (r[0], r[1]) if r else (None, "")
+
+    def mark_mirrored(self, tab: str, rows: int, dirty_from: Optional[str]):
+        """
+        Record a completed sheet write of the tail from `dirty_from`. If an
+        earlier date was dirtied meanwhile, that mark is kept for the next sync.
+        """
+        with self._tx() as db:
+            r = db.execute("SELECT dirty_from FROM mirror WHERE tab = ?", (tab,)).fetchone()
+            still = r[0] if r else None
+            db.execute("INSERT OR REPLACE INTO mirror (tab, rows, dirty_from) VALUES (?, ?, ?)",
+                       (tab, rows, None if still == dirty_from else still))
+
+
+_stores: Dict[str, SeriesStore] = {}
+_stores_lock = threading.Lock()
+
+def open_store(path: Optional[str] = None) -> SeriesStore:
+    """Process-wide SeriesStore for `path` (default: $SERIES_DB_PATH)."""
+    path = path or DB_PATH
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = SeriesStore(path)
+        return _stores[path]
@@ -0,0 +1,58 @@
+"""
+Persisted index of rows already synced to a Google Sheet tab.
+
+Stored next to the JSON output (e.g. 'docs/data/Policy_Events.sheet_index.json'):
+  rows   number of sheet rows including the header
+  tail   fingerprint of the last row written
+  keys   sorted compact hashes of the synced records' keys
+
+A sync verifies the index with one small tail-range read (the last known row
+must match the fingerprint and the next row must be empty) and then appends
+only records whose key hash is not in the index. Only when that check fails is
+the full tab downloaded to rebuild the index.
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, Iterable, List, Optional
+
+from fileio import write_if_changed
+
+INDEX_VERSION = 1
+
+
+def key_hash(key: str) -> str:
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=8).hexdigest()
+
+def row_fingerprint(row: Iterable, width: int) -> str:
+    cells = [str(c) for c in row][:width]
+    cells += [""] * (width - len(cells))
+    return hashlib.blake2b("\x1f".join(cells).encode("utf-8"), digest_size=8).hexdigest()
+
+def index_path_for(data_path: str) -> str:
+    return os.path.splitext(data_path)[0] + ".sheet_index.json"
+
+def load_index(path: str) -> Optional[Dict]:
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        idx = json.load(f)
+    if idx.get("version") != INDEX_VERSION:
+        return None
+    idx["keys"] = set(idx.get("keys", []))
+    return idx
+
+def save_index(idx: Dict, path: str):
+    out = dict(idx, version=INDEX_VERSION, keys=sorted(idx["keys"]))
+    write_if_changed(path, json.dumps(out, separators=(",", ":")).encode("utf-8"))
+
+def build_index(values: List[List], key_fn, width: int) -> Dict:
+    """
+    Rebuild the index from a full download of the tab (header row first).
+    """
+    return {
+        "rows": len(values),
+        "tail": row_fingerprint(values[-1], width) if values else "",
+        "keys": {key_hash(key_fn(row)) for row in values[1:]},
+    }
@@ -0,0 +1,78 @@
+"""
+Process-wide Google Sheets client.
+
+Service-account credentials are parsed and gspread is authorized once per
+process; spreadsheets opened by key are cached too, so repeated helpers
+(log_update, update_sheet, ...) don't pay the OAuth and metadata round trips
+again on every call. gspread and google-auth are imported on first use, so
+importing this module (e.g. from a pipeline stage that may not need Sheets) is cheap.
+
+Environment variables:
+  GOOGLE_CREDENTIALS  JSON string of a service account
+  GOOGLE_SHEET_ID     default spreadsheet ID (not URL)
+"""
+
+import json
+import os
+import threading
+from typing import TYPE_CHECKING, Dict, Optional
+
+from telemetry import span, telemetry
+
+if TYPE_CHECKING:
+    import gspread
+
+SCOPES = [
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/drive"
+]
+
+_lock = threading.RLock()
+_clients: Dict[str, "gspread.Client"] = {}
+_spreadsheets: Dict[str, "gspread.Spreadsheet"] = {}
+
+
+def get_client(credentials_json: Optional[str] = None) -> "gspread.Client":
+    """
+    Authorized gspread client for the given service-account JSON (default: $GOOGLE_CREDENTIALS).
+    """
+    credentials_json = credentials_json or os.environ["GOOGLE_CREDENTIALS"]
+    with _lock:
+        gc = _clients.get(credentials_json)
+        if gc is None:
+            with span("auth"):
+                import gspread
+                from google.oauth2.service_account import Credentials
+
+                creds = Credentials.from_service_account_info(json.loads(credentials_json), scopes=SCOPES)
+                gc = gspread.authorize(creds)
+            _clients[credentials_json] = telemetry.instrument_gspread(gc)
+        return gc
+
+def open_spreadsheet(sheet_id: Optional[str] = None, credentials_json: Optional[str] = None) -> "gspread.Spreadsheet":
+    """
+    Cached Spreadsheet handle for sheet_id (default: $GOOGLE_SHEET_ID).
+    """
+    sheet_id = sheet_id or os.environ["GOOGLE_SHEET_ID"]
+    with _lock:
+        sh = _spreadsheets.get(sheet_id)
+        if sh is None:
+            gc = get_client(credentials_json)
+            with span("auth", step="open_spreadsheet"):
+                sh = gc.open_by_key(sheet_id)
+            _spreadsheets[sheet_id] = sh
+        return sh
+
+def register_spreadsheet(sh, sheet_id: Optional[str] = None):
+    """
+    Serve an already-open spreadsheet (or an in-memory stand-in, see
+    benchmarks/fakes.py) for sheet_id instead of authorizing and opening one.
+    """
+    with _lock:
+        _spreadsheets[sheet_id or os.environ["GOOGLE_SHEET_ID"]] = sh
+
+def reset():
+    """Drop cached clients and spreadsheets."""
+    with _lock:
+        _clients.clear()
+        _spreadsheets.clear()
@@ -0,0 +1,165 @@
+"""
+Google Sheets mirror of the local series store (see series_store.py).
+
+The sheet is no longer read or written on the hot path: fetchers write to the
+store, exports read from it, and this module pushes what changed afterwards.
+
+  mirror()     for every dirty tab, write the rows from its earliest changed
+               date onward (revisions and new rows alike), or clear and
+               rewrite the tab when it has to be replaced; all tabs go out
+               in one values_batch_update, so Sheets calls don't grow with
+               the number of series
+  bootstrap()  one-time import of a tab's existing sheet history into the store
+
+A failed write (quota, network) leaves the tab dirty, so the next run retries
+it. Run standalone with `python sheets_mirror.py [TAB ...]`.
+"""
+
+import os
+import sys
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from series_store import SeriesStore, open_store
+from sheets_client import open_spreadsheet
+from telemetry import run_report, span
+
+# Rows per values_batch_update request (keeps request bodies well under the API limit)
+MIRROR_BATCH_ROWS = int(os.getenv("MIRROR_BATCH_ROWS", "50000"))
+
+
+def _quote(tab: str) -> str:
+    return "'{}'".format(tab.replace("'", "''"))
+
+def read_sheet_rows(sheet, tab: str) -> Tuple[List, List[List]]:
+    """(header, data rows) of a tab: typed numbers, dates as their formatted strings."""
+    resp = sheet.values_batch_get(
+        [_quote(tab)],
+        params={"valueRenderOption": "UNFORMATTED_VALUE", "dateTimeRenderOption": "FORMATTED_STRING"},
+    )
+    values = (resp.get("valueRanges") or [{}])[0].get("values", [])
+    if not values:
+        return [], []
+    return values[0], [r for r in values[1:] if r and r[0] not in ("", None)]
+
+def bootstrap(tab: str, store: Optional[SeriesStore] = None, sheet=None) -> bool:
+    """
+    Seed `tab` in the store from the sheet if the store doesn't have it yet.
+    Returns True when rows were imported.
+    """
+    store = store or open_store()
+    if store.has(tab):
+        return False
+    sheet = sheet or open_spreadsheet()
+    with span("sheet_read", tab=tab, step="bootstrap"):
+        try:
+            header, rows = read_sheet_rows(sheet, tab)
+        except Exception as e:
+            print(f"⚠️ Could not read {tab} to seed the local store: {e}")
+            return False
+    if not header:
+        return False
+    rows = [[str(r[0])] + list(r[1:]) for r in rows]
+    in_order = all(a[0] < b[0] for a, b in zip(rows, rows[1:]))
+    # The sheet matches the store as-is only if its dates are unique and sorted
+    store.replace(tab, header, rows, mirrored=in_order)
+    print(f"✅ Seeded local store with {len(rows)} rows of {tab}")
+    return True
+
+def _cells(row: List, width: int) -> List:
+    """
+    A row as written to the sheet: missing values (None) become "" and short
+    rows are padded, since values_batch_update leaves cells it's given no
+    value for as they were.
+    """
+    cells = ["" if c is None else c for c in row]
+    return cells + [""] * (width - len(cells))
+
+def plan_tab(tab: str, store: SeriesStore) -> Optional[Dict]:
+    """
+    What mirroring `tab` takes: the rows to write at `row` (1-based), and
+    whether the tab has to be cleared first. None if the tab is clean.
+    """
+    known, dirty_from = store.mirror_state(tab)
+    if dirty_from is None:
+        return None
+    header = store.header(tab) or []
+    offset = store.count(tab, before=dirty_from) if dirty_from else 0
+    rows = [_cells(r, len(header)) for r in store.rows(tab, start=dirty_from or None)]
+    total = offset + len(rows)
+    if not dirty_from or known is None or total < known:
+        # Replace the whole tab (first sync, header change, or rows removed)
+        return {"tab": tab, "clear": True, "row": 1, "values": [header] + rows, "rows": len(rows),
+                "total": total, "dirty_from": dirty_from, "width": len(header)}
+    return {"tab": tab, "clear": False, "row": offset + 2, "values": rows, "rows": len(rows),
+            "total": total, "dirty_from": dirty_from, "width": len(header)}
+
+def _grid_requests(sheet, plans: List[Dict]) -> List[Dict]:
+    """addSheet / grid resize requests so every planned write fits its tab."""
+    sheets = {ws.title: ws for ws in sheet.worksheets()}
+    requests = []
+    for p in plans:
+        need_rows = p["row"] - 1 + len(p["values"])
+        need_cols = max([p["width"]] + [len(r) for r in p["values"]])
+        ws = sheets.get(p["tab"])
+        if ws is None:
+            requests.append({"addSheet": {"properties": {
+                "title": p["tab"], "gridProperties": {"rowCount": max(1000, need_rows), "columnCount": max(10, need_cols)}}}})
+        elif ws.row_count < need_rows or ws.col_count < need_cols:
+            requests.append({"updateSheetProperties": {
+                "properties": {"sheetId": ws.id, "gridProperties": {
+                    "rowCount": max(ws.row_count, need_rows), "columnCount": max(ws.col_count, need_cols)}},
+                "fields": "gridProperties(rowCount,columnCount)"}})
+    return requests
+
+def write_batched(sheet, plans: List[Dict]):
+    """
+    Commit every planned tab write with a fixed number of calls, however many
+    tabs: one metadata read, at most one batch_update (new tabs, grid sizes),
+    one values_batch_clear and one values_batch_update per MIRROR_BATCH_ROWS rows.
+    """
+    requests = _grid_requests(sheet, plans)
+    if requests:
+        sheet.batch_update({"requests": requests})
+    clears = [_quote(p["tab"]) for p in plans if p["clear"]]
+    if clears:
+        sheet.values_batch_clear(body={"ranges": clears})
+    data, rows = [], 0
+    for p in plans:
+        if not p["values"]:
+            continue
+        data.append({"range": f"{_quote(p['tab'])}!A{p['row']}", "values": p["values"]})
+        rows += len(p["values"])
+        if rows >= MIRROR_BATCH_ROWS:
+            sheet.values_batch_update({"valueInputOption": "RAW", "data": data})
+            data, rows = [], 0
+    if data:
+        sheet.values_batch_update({"valueInputOption": "RAW", "data": data})
+
+def mirror(tabs: Optional[Iterable[str]] = None, store: Optional[SeriesStore] = None) -> Dict[str, int]:
+    """
+    Mirror the given tabs (default: every dirty tab) to Google Sheets in one
+    batched write. Returns {tab: rows written}; on failure nothing is marked
+    mirrored, so every tab stays dirty for the next run.
+    """
+    store = store or open_store()
+    dirty = store.dirty_tabs()
+    tabs = dirty if tabs is None else [t for t in tabs if t in set(dirty)]
+    plans = [p for p in (plan_tab(t, store) for t in tabs) if p is not None]
+    if not plans:
+        return {}
+    try:
+        with span("sheet_write", tabs=len(plans), mode="mirror"):
+            write_batched(open_spreadsheet(), plans)
+    except Exception as e:
+        print(f"❌ Failed to mirror {', '.join(p['tab'] for p in plans)} to Google Sheets: {e}")
+        return {}
+    written = {}
+    for p in plans:
+        store.mark_mirrored(p["tab"], p["total"], p["dirty_from"])
+        written[p["tab"]] = p["rows"]
+        print(f"✅ Mirrored {p['rows']} rows of {p['tab']} to Google Sheets")
+    return written
+
+if __name__ == "__main__":
+    with run_report("sheets_mirror"):
+        mirror(sys.argv[1:] or None)
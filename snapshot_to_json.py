@@ -1,37 +1,275 @@
-
-import gspread
 import json
-from google.oauth2.service_account import Credentials
 import os
+from datetime import date, datetime, timedelta
+from columnar import write_columnar
+from downsample import build_bundle
+from fileio import write_atomic, write_if_changed
+from series_registry import bundle_series, tabs
+from series_store import open_store
+from sheets_client import open_spreadsheet
+from telemetry import run_report, span
+
+# Read mode: 'batch' pulls every tab in one values_batch_get request (per
+# BATCH_TABS tabs); 'per_tab' is the old worksheet()+get_all_records() path.
+READ_MODE = os.getenv("SNAPSHOT_READ_MODE", "batch")
+BATCH_TABS = int(os.getenv("SNAPSHOT_BATCH_TABS", "50"))
+
+# Output formats: 'json' (array of records) and/or 'columnar' (<tab>.col.json,
+# run-length/delta encoded, with opt-in .gz/.br siblings; see columnar.py)
+FORMATS = {f.strip() for f in os.getenv("SNAPSHOT_FORMATS", "json,columnar").split(",") if f.strip()}
+
+# Per-tab signature of the last export: the store version (plus the day, for
+# rollover tabs) or the spreadsheet's modifiedTime. Tabs whose signature and
+# output files are unchanged are neither read nor rewritten.
+SNAPSHOT_MANIFEST = os.getenv("SNAPSHOT_MANIFEST", "state/export_manifest.json")
+
+# Tabs to export: every registered series. Policy_Events is published by
+# policy_tracker.py from its own store, not from the sheet.
+TABS = tabs()
+
+# Pre-merged dashboard bundle (see downsample.py): label -> (tab, value columns
+# in order of preference). Labels match SERIES in docs/dashboard.js.
+BUNDLE_PATH = os.getenv("SNAPSHOT_BUNDLE_PATH", "docs/data/series_bundle.json")
+BUNDLE_SERIES = bundle_series()
+
+# Derived-metric tabs written to the series store by derived_metrics.py
+def derived_tab(tab):
+    return f"{tab}_Derived"
+
+DERIVED_TABS = [derived_tab(tab) for tab, _ in BUNDLE_SERIES.values()]
 
-# Load credentials from GitHub secret
-creds_dict = json.loads(os.environ["GOOGLE_CREDENTIALS"])
-creds = Credentials.from_service_account_info(creds_dict, scopes=["https://www.googleapis.com/auth/spreadsheets.readonly"])
-gc = gspread.authorize(creds)
+# Price tabs stored as change events (see PRICE_STORAGE in price_scraper.py);
+# each row is rolled forward day by day until the next change, or today.
+ROLLOVER_TABS = set(tabs("scrape"))
 
-SHEET_ID = os.environ["GOOGLE_SHEET_ID"]
-sheet = gc.open_by_key(SHEET_ID)
+def expand_rollover(records, until=None):
+    """Expand change-event rows into one row per day (no-op for daily history)."""
+    until = until or datetime.utcnow().date()
+    out = []
+    for i, rec in enumerate(records):
+        try:
+            day = date.fromisoformat(str(rec.get("Date", "")))
+            end = date.fromisoformat(str(records[i + 1]["Date"])) if i + 1 < len(records) else until + timedelta(days=1)
+        except ValueError:
+            out.append(rec)
+            continue
+        out.append(rec)
+        day += timedelta(days=1)
+        while day < end:
+            out.append(dict(rec, Date=day.isoformat()))
+            day += timedelta(days=1)
+    return out
 
-# Tabs to export
-TABS = [
-    "Egg_Prices",
-    "Gas_Prices",
-    "iPhone_Prices",
-    "Car_Prices",
-    "Interest_Rates",
-    "Stock_Market",
-    "Policy_Events"
-]
+def rows_to_records(values):
+    """Map a tab's raw rows to dicts keyed by its header row (like get_all_records)."""
+    if not values:
+        return []
+    header = values[0]
+    width = len(header)
+    pad = [""] * width
+    return [dict(zip(header, row + pad[len(row):])) for row in values[1:]]
 
-os.makedirs("docs/data", exist_ok=True)
+def read_tab(sheet, tab):
+    return sheet.worksheet(tab).get_all_records()
 
-for tab in TABS:
+def read_tabs_batched(sheet, tabs):
+    """
+    Read tabs with one values_batch_get per BATCH_TABS tabs. Numbers come back
+    unformatted (already typed), dates as their formatted strings.
+    Returns {tab: records}; tabs that fail are omitted and reported.
+    """
+    out = {}
+    for i in range(0, len(tabs), BATCH_TABS):
+        batch = tabs[i:i + BATCH_TABS]
+        try:
+            resp = sheet.values_batch_get(
+                ["'{}'".format(t.replace("'", "''")) for t in batch],
+                params={"valueRenderOption": "UNFORMATTED_VALUE", "dateTimeRenderOption": "FORMATTED_STRING"},
+            )
+            for tab, vr in zip(batch, resp.get("valueRanges", [])):
+                out[tab] = rows_to_records(vr.get("values", []))
+        except Exception as e:
+            # e.g. a missing tab fails the whole batch; retry those tabs one by one
+            print(f"⚠️ Batched read failed ({e}); falling back to per-tab reads")
+            for tab in batch:
+                try:
+                    out[tab] = read_tab(sheet, tab)
+                except Exception as e:
+                    print(f"❌ Failed to export {tab}: {e}")
+    return out
+
+def load_manifest():
     try:
-        ws = sheet.worksheet(tab)
-        rows = ws.get_all_records()
-        out_path = f"docs/data/{tab}.json"
-        with open(out_path, "w") as f:
-            json.dump(rows, f, indent=2)
-        print(f"✅ Exported {tab} to {out_path}")
+        with open(SNAPSHOT_MANIFEST) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(manifest):
+    data = json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8")
+    write_if_changed(SNAPSHOT_MANIFEST, data)
+
+def output_paths(tab):
+    paths = []
+    if "json" in FORMATS:
+        paths.append(f"docs/data/{tab}.json")
+    if "columnar" in FORMATS:
+        paths.append(f"docs/data/{tab}.col.json")
+    return paths
+
+def up_to_date(manifest, tab, signature):
+    """True if `tab` was last exported at `signature` and its outputs are still there."""
+    return (signature is not None and manifest.get(tab) == signature
+            and all(os.path.exists(p) for p in output_paths(tab)))
+
+def store_signature(store, tab):
+    sig = f"store:{store.version(tab)}"
+    # Rollover rows are extended to today, so these change daily regardless
+    return f"{sig}:{datetime.utcnow().date().isoformat()}" if tab in ROLLOVER_TABS else sig
+
+def sheet_signature(sheet):
+    """The spreadsheet's last modification time (Drive metadata), or None if unavailable."""
+    try:
+        t = sheet.get_lastUpdateTime()
     except Exception as e:
-        print(f"❌ Failed to export {tab}: {e}")
+        print(f"⚠️ Couldn't read the spreadsheet's modification time ({e}); exporting every tab")
+        return None
+    return f"sheet:{t}" if t else None
+
+def write_tab(tab, rows):
+    """Write a tab's exports; returns the (rolled-over) records written."""
+    with span("json_write", tab=tab):
+        return _write_tab(tab, rows)
+
+def _write_tab(tab, rows):
+    if tab in ROLLOVER_TABS:
+        rows = expand_rollover(rows)
+    written = []
+    if "json" in FORMATS:
+        out_path = f"docs/data/{tab}.json"
+        if write_if_changed(out_path, json.dumps(rows, indent=2).encode("utf-8")):
+            written.append(out_path)
+    if "columnar" in FORMATS:
+        written += write_columnar(rows, f"docs/data/{tab}.col.json")
+    if written:
+        print(f"✅ Exported {tab} to {', '.join(written)}")
+    else:
+        print(f"✅ {tab} unchanged")
+    return rows
+
+def _to_float(v):
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return None
+
+def bundle_points(records, keys):
+    """[(date, value)] from export records, skipping rows without a numeric value."""
+    out = []
+    for rec in records:
+        d = str(rec.get("Date", ""))[:10]
+        v = next((_to_float(rec[k]) for k in keys if k in rec), None)
+        if d and v is not None:
+            out.append((d, v))
+    out.sort()
+    return out
+
+def published_records(tab):
+    """Records for a tab not exported this run: the local store, else its published JSON."""
+    store = open_store()
+    if store.has(tab):
+        records = store.records(tab)
+        return expand_rollover(records) if tab in ROLLOVER_TABS else records
+    path = f"docs/data/{tab}.json"
+    if os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return []
+
+def write_bundle(exported):
+    """
+    Write the merged, multi-resolution dashboard bundle. `exported` holds the
+    records written this run; other tabs come from published_records().
+    """
+    with span("json_write", tab="bundle"):
+        series = {}
+        for label, (tab, keys) in BUNDLE_SERIES.items():
+            records = exported[tab] if tab in exported else published_records(tab)
+            series[label] = bundle_points(records, keys)
+        bundle = build_bundle(series, datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"))
+        if _same_bundle(bundle):
+            print("✅ Dashboard bundle unchanged")
+            return
+        write_atomic(BUNDLE_PATH, json.dumps(bundle, separators=(",", ":")).encode("utf-8"))
+    sizes = ", ".join(f"{k} {len(v['dates'])}" for k, v in bundle["resolutions"].items())
+    print(f"✅ Exported dashboard bundle to {BUNDLE_PATH} ({sizes} dates)")
+
+def _same_bundle(bundle):
+    """True if the published bundle differs from `bundle` only in its 'generated' stamp."""
+    try:
+        with open(BUNDLE_PATH) as f:
+            old = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return dict(old, generated=None) == dict(bundle, generated=None)
+
+def main(tabs=None):
+    """
+    Export `tabs` (default: all TABS and the stored derived tabs) to docs/data,
+    then rebuild the dashboard bundle. Tabs held in the local series store are
+    exported from it; the rest are read from Google Sheets. Tabs unchanged
+    since their last export (see SNAPSHOT_MANIFEST) are skipped.
+    """
+    store = open_store()
+    known = TABS + [t for t in DERIVED_TABS if store.has(t)]
+    tabs = known if tabs is None else [t for t in known if t in set(tabs)]
+    if not tabs:
+        print("✅ Nothing to export")
+        return
+    os.makedirs("docs/data", exist_ok=True)
+    manifest = load_manifest()
+    exported = {}
+    skipped = []
+
+    for tab in [t for t in tabs if store.has(t)]:
+        sig = store_signature(store, tab)
+        if up_to_date(manifest, tab, sig):
+            skipped.append(tab)
+            continue
+        with span("store_read", tab=tab):
+            rows = store.records(tab)
+        exported[tab] = write_tab(tab, rows)
+        manifest[tab] = sig
+    remote = [t for t in tabs if not store.has(t)]
+
+    if remote:
+        sheet = open_spreadsheet()
+        sig = sheet_signature(sheet)
+        skipped += [t for t in remote if up_to_date(manifest, t, sig)]
+        remote = [t for t in remote if t not in skipped]
+    if remote and READ_MODE == "batch":
+        with span("sheet_read", tabs=len(remote)):
+            tables = read_tabs_batched(sheet, remote)
+        for tab, rows in tables.items():
+            exported[tab] = write_tab(tab, rows)
+            manifest[tab] = sig
+    elif remote:
+        for tab in remote:
+            try:
+                with span("sheet_read", tab=tab):
+                    rows = read_tab(sheet, tab)
+                exported[tab] = write_tab(tab, rows)
+                manifest[tab] = sig
+            except Exception as e:
+                print(f"❌ Failed to export {tab}: {e}")
+
+    if skipped:
+        print(f"✅ {len(skipped)} tabs unchanged since the last export: {', '.join(skipped)}")
+    save_manifest(manifest)
+
+    if any(tab in exported for tab, _ in BUNDLE_SERIES.values()):
+        write_bundle(exported)
+
+if __name__ == "__main__":
+    with run_report("snapshot_to_json"):
+        main()
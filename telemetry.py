@@ -0,0 +1,185 @@
+"""
+Lightweight run telemetry shared by all scripts.
+
+Records per-stage spans (auth, fetch, parse, sheet_read, sheet_write, json_write),
+HTTP request/retry/byte counters for every session built by http_session, Google
+Sheets API calls (with the busiest minute, to compare against quota) and peak RSS.
+
+Usage:
+    with run_report("data_updater"):
+        main()
+
+    with span("fetch", series="DGS10"):
+        ...
+
+On exit the run writes a machine-readable JSON report to
+RUN_REPORT_DIR/<script>.json (default directory: 'run_reports') and, when
+RUN_REPORT_TO_SHEET=1, a one-line summary row to Update_Notes.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+log = logging.getLogger("telemetry")
+
+RUN_REPORT_DIR = os.getenv("RUN_REPORT_DIR", "run_reports")
+RUN_REPORT_TO_SHEET = os.getenv("RUN_REPORT_TO_SHEET", "") not in ("", "0", "false")
+
+
+class Telemetry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started = time.time()
+            self.spans: List[Dict] = []
+            self.counters: Counter = Counter()
+            self.sheets_call_times: List[float] = []
+
+    # ---- spans & counters ----
+    @contextmanager
+    def span(self, name: str, **attrs):
+        t0 = time.perf_counter()
+        ok = True
+        try:
+            yield
+        except BaseException:
+            ok = False
+            raise
+        finally:
+            rec = {"name": name, "duration_s": round(time.perf_counter() - t0, 4), "ok": ok}
+            if attrs:
+                rec["attrs"] = attrs
+            with self._lock:
+                self.spans.append(rec)
+
+    # ---- hooks ----
+    def _http_hook(self, resp, *args, **kwargs):
+        retries = getattr(getattr(resp, "raw", None), "retries", None)
+        nbytes = resp.headers.get("Content-Length")
+        nbytes = int(nbytes) if nbytes and nbytes.isdigit() else len(resp.content or b"")
+        with self._lock:
+            self.counters["http_requests"] += 1
+            self.counters["http_bytes"] += nbytes
+            self.counters[f"http_status_{resp.status_code}"] += 1
+            if retries is not None and retries.history:
+                self.counters["http_retries"] += len(retries.history)
+            cache = resp.headers.get("X-Cache")
+            if cache:
+                self.counters[f"http_cache_{cache.lower()}"] += 1
+
+    def _sheets_hook(self, resp, *args, **kwargs):
+        with self._lock:
+            self.counters["sheets_calls"] += 1
+            self.sheets_call_times.append(time.time())
+
+    def instrument_session(self, session):
+        """Count requests/bytes/retries on a requests.Session."""
+        session.hooks.setdefault("response", []).append(self._http_hook)
+        return session
+
+    def instrument_gspread(self, client):
+        """Count Sheets API calls made through a gspread Client (v5 or v6)."""
+        http = getattr(client, "http_client", client)
+        session = getattr(http, "session", None)
+        if session is not None:
+            session.hooks.setdefault("response", []).append(self._sheets_hook)
+        return client
+
+    # ---- report ----
+    def report(self, script: str) -> Dict:
+        with self._lock:
+            spans = list(self.spans)
+            counters = dict(self.counters)
+            times = list(self.sheets_call_times)
+        by_stage: Dict[str, Dict] = defaultdict(lambda: {"count": 0, "total_s": 0.0, "max_s": 0.0, "errors": 0})
+        for s in spans:
+            agg = by_stage[s["name"]]
+            agg["count"] += 1
+            agg["total_s"] = round(agg["total_s"] + s["duration_s"], 4)
+            agg["max_s"] = max(agg["max_s"], s["duration_s"])
+            agg["errors"] += 0 if s["ok"] else 1
+        per_minute = Counter(int(t // 60) for t in times)
+        return {
+            "script": script,
+            "started": datetime.utcfromtimestamp(self.started).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "duration_s": round(time.time() - self.started, 3),
+            "stages": dict(by_stage),
+            "spans": spans,
+            "counters": counters,
+            "sheets": {
+                "calls": len(times),
+                "peak_calls_per_minute": max(per_minute.values(), default=0),
+            },
+            "peak_rss_mb": peak_rss_mb(),
+        }
+
+
+def peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    # ru_maxrss is KiB on Linux
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+telemetry = Telemetry()
+span = telemetry.span
+
+
+def summary_line(rep: Dict) -> str:
+    c = rep["counters"]
+    slowest = sorted(rep["stages"].items(), key=lambda kv: -kv[1]["total_s"])[:3]
+    stages = ", ".join(f"{k} {v['total_s']:.1f}s" for k, v in slowest)
+    return (
+        f"{rep['duration_s']:.1f}s; http {c.get('http_requests', 0)} req / "
+        f"{c.get('http_bytes', 0) / 2 ** 20:.2f} MB / {c.get('http_retries', 0)} retries; "
+        f"sheets {rep['sheets']['calls']} calls (peak {rep['sheets']['peak_calls_per_minute']}/min); "
+        f"rss {rep['peak_rss_mb']} MB; {stages}"
+    )
+
+def write_report(rep: Dict, directory: str = RUN_REPORT_DIR) -> str:
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{rep['script']}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(rep, f, indent=2)
+    return path
+
+@contextmanager
+def run_report(script: str):
+    """
+    Reset telemetry, run the body, then write the JSON report (also on failure).
+    """
+    telemetry.reset()
+    try:
+        yield telemetry
+    finally:
+        try:
+            # Include the buffered Update_Notes write in this run's numbers
+            from log_update_notes import flush_updates
+            flush_updates()
+        except Exception:
+            pass
+        rep = telemetry.report(script)
+        path = write_report(rep)
+        print(f"📊 {script}: {summary_line(rep)} (report: {path})")
+        if RUN_REPORT_TO_SHEET:
+            try:
+                from log_update_notes import log_update
+                log_update(tab_name=script, row_count=0, update_type="run_report",
+                           note=summary_line(rep), source_url="")
+            except Exception as e:
+                log.warning("Could not log run summary to Update_Notes: %s", e)
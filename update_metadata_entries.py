@@ -1,30 +1,58 @@
+import os
+from series_registry import METADATA_HEADER, METADATA_TAB, metadata_rows
+from sheets_client import open_spreadsheet
 
-import gspread
-from google.oauth2.service_account import Credentials
-
-# Google Sheets authentication
-scopes = [
-    "https://www.googleapis.com/auth/spreadsheets",
-    "https://www.googleapis.com/auth/drive"
-]
-credentials = Credentials.from_service_account_file("credentials.json", scopes=scopes)
-gc = gspread.authorize(credentials)
-sheet = gc.open_by_key("12_lLnv3t7Om8XHRwFA7spCJ8at282WE7hisxu23gITo")
-
-# Get metadata worksheet
-meta_ws = sheet.worksheet("Metadata")
-existing_rows = meta_ws.get_all_values()
-existing_set = {tuple(row) for row in existing_rows}
-
-# New metadata entries
-new_metadata = [
-    ["iPhone_Prices", "MSRP of base model iPhone with 128GB storage", "Apple", "USD", "Daily scrape from Apple.com with rollover if unchanged", "https://www.apple.com/iphone/"],
-    ["Car_Prices", "MSRP of Toyota RAV4 XLE by model year", "Toyota", "USD", "Annual MSRP tracked daily with rollover; pulled from pressroom releases", "https://pressroom.toyota.com/releases/"]
-]
-
-# Append if not already present
-for row in new_metadata:
-    if tuple(row) not in existing_set:
-        meta_ws.append_row(row)
-
-print("✅ Metadata entries added or already exist.")
+# Spreadsheet to update (defaults to the project sheet)
+SHEET_ID = os.getenv("GOOGLE_SHEET_ID", "12_lLnv3t7Om8XHRwFA7spCJ8at282WE7hisxu23gITo")
+
+def merged_rows(existing_rows):
+    """
+    The Metadata tab with each registered series' row updated in place (or
+    appended); rows for tabs outside the registry are kept as they are.
+    Blank rows and repeated rows of a registered tab are dropped. Cells right
+    of the registry's columns (hand-added notes) are kept.
+    """
+    width = len(METADATA_HEADER)
+    wanted = {row[0]: row for row in metadata_rows()}
+    header = existing_rows[0] if existing_rows else []
+    out = [METADATA_HEADER + header[width:]]
+    for row in existing_rows[1:]:
+        if row and row[0] in wanted:
+            if wanted[row[0]] is not None:
+                out.append(wanted[row[0]] + row[width:])
+                wanted[row[0]] = None
+        elif any(row):
+            out.append(row)
+    return out + [row for row in wanted.values() if row is not None]
+
+def registry_columns(rows):
+    """Non-blank `rows` cut or padded to the registry-owned columns, for comparison."""
+    width = len(METADATA_HEADER)
+    return [r[:width] + [""] * (width - len(r)) for r in rows if any(r)]
+
+def main():
+    # Google Sheets authentication (shared, cached client)
+    sheet = open_spreadsheet(SHEET_ID)
+
+    # Get metadata worksheet
+    meta_ws = sheet.worksheet(METADATA_TAB)
+    existing_rows = meta_ws.get_all_values()
+
+    # Rewrite the tab only if the registry changed it, in one request: the
+    # grid is padded with blanks to the old extent, so rows and cells that
+    # are gone get cleared by the same write (never an emptied tab on failure)
+    rows = merged_rows(existing_rows)
+    changed = registry_columns(existing_rows) != registry_columns(rows)
+    if changed:
+        width = max(len(r) for r in existing_rows + rows)
+        grid = [r + [""] * (width - len(r)) for r in rows]
+        grid += [[""] * width for _ in range(len(existing_rows) - len(rows))]
+        title = METADATA_TAB.replace("'", "''")
+        sheet.values_batch_update({"valueInputOption": "RAW",
+                                   "data": [{"range": f"'{title}'!A1", "values": grid}]})
+
+    print("✅ Metadata entries updated." if changed else "✅ Metadata entries already up to date.")
+    return [METADATA_TAB] if changed else []
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,4 @@
+"""
+Unified pipeline runner: `python -m updater run` executes the FRED, policy,
+price-scraper, metadata and snapshot stages in one process (see pipeline.py).
+"""
@@ -0,0 +1,39 @@
+import argparse
+import sys
+
+from telemetry import run_report
+from updater.pipeline import STAGES, run
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m updater", description="Run the data pipeline stages.")
+    sub = ap.add_subparsers(dest="command", required=True)
+    run_p = sub.add_parser("run", help="run stages in dependency order")
+    run_p.add_argument("--stages", default=",".join(STAGES), help="comma list of stages (default: all)")
+    run_p.add_argument("--skip", default="", help="comma list of stages to leave out")
+    run_p.add_argument("--workers", type=int, default=4, help="stages run in parallel")
+    run_p.add_argument("--export-all", action="store_true", help="export every tab, not just changed ones")
+    sub.add_parser("list", help="show stages and their dependencies")
+    args = ap.parse_args(argv)
+
+    if args.command == "list":
+        for name, stage in STAGES.items():
+            print(f"{name:<10} after: {', '.join(stage['deps']) or '-'}")
+        return 0
+
+    skip = {s.strip() for s in args.skip.split(",") if s.strip()}
+    stages = [s.strip() for s in args.stages.split(",") if s.strip() and s.strip() not in skip]
+    with run_report("pipeline"):
+        results = run(stages, workers=args.workers, export_all=args.export_all)
+
+    for name in stages:
+        res = results[name]
+        mark = "✅" if res["ok"] else "❌"
+        detail = ", ".join(res["changed"]) or "no tab changes"
+        if not res["ok"]:
+            detail = res["error"]
+        print(f"{mark} {name:<10} {res['duration_s']:>7.2f}s  {detail}")
+    return 0 if all(r["ok"] for r in results.values()) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""
+Dependency-ordered stage runner.
+
+Each stage is a dict with its upstream dependencies and a run function that
+returns the sheet tabs it changed. Stages whose dependencies are done run in
+parallel on a thread pool and share the process-wide Sheets client
+(sheets_client) and HTTP response cache (http_cache). Stage modules, and with
+them gspread/bs4, are imported only when the stage actually runs.
+
+The fetch stages write to the local series store (series_store.py), and the
+derived stage adds the derived-metric tabs computed from it. The
+snapshot stage then exports only the tabs that upstream stages reported as
+changed (everything with export_all, or when none of its upstream stages
+were selected), while the mirror stage pushes the
+same changes to Google Sheets in parallel. A failing stage is reported but
+does not stop independent stages or the export of the others.
+"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterable, List, Optional, Set
+
+from telemetry import span
+
+
+def _fred(changed: Set[str]) -> List[str]:
+    import data_updater
+    return data_updater.main()
+
+def _policy(changed: Set[str]) -> List[str]:
+    import policy_tracker
+    policy_tracker.main()
+    # policy_tracker publishes Policy_Events from its own store; the snapshot
+    # doesn't export it, so nothing is handed on.
+    return []
+
+def _prices(changed: Set[str]) -> List[str]:
+    import price_scraper
+    return price_scraper.main()
+
+def _metadata(changed: Set[str]) -> List[str]:
+    import update_metadata_entries
+    return update_metadata_entries.main()
+
+def _derived(changed: Set[str]) -> List[str]:
+    import derived_metrics
+    return derived_metrics.main()
+
+def _reactions(changed: Set[str]) -> List[str]:
+    import event_reactions
+    event_reactions.main()
+    return []
+
+def _mirror(changed: Set[str]) -> List[str]:
+    import sheets_mirror
+    sheets_mirror.mirror()
+    return []
+
+def _snapshot(changed: Set[str], export_all: bool = False, deps_ran: bool = True) -> List[str]:
+    import snapshot_to_json
+    # With no upstream stage in this run there is no change list to go by:
+    # consider every tab and let the export manifest skip the unchanged ones
+    snapshot_to_json.main(None if export_all or not deps_ran else sorted(changed))
+    return []
+
+
+STAGES: Dict[str, Dict] = {
+    "fred": {"deps": [], "run": _fred},
+    "policy": {"deps": [], "run": _policy},
+    "prices": {"deps": [], "run": _prices},
+    "metadata": {"deps": [], "run": _metadata},
+    # Recomputes only the tails of the derived tabs, so it always runs after the fetchers
+    "derived": {"deps": ["fred", "prices"], "run": _derived},
+    "reactions": {"deps": ["fred", "policy", "prices"], "run": _reactions},
+    "snapshot": {"deps": ["fred", "policy", "prices", "metadata", "derived"], "run": _snapshot},
+    # Sheets are a mirror of the local series store, written off the export path
+    "mirror": {"deps": ["fred", "prices", "derived"], "run": _mirror},
+}
+
+
+def run(selected: Optional[Iterable[str]] = None, workers: int = 4, export_all: bool = False) -> Dict[str, Dict]:
+    """
+    Run the selected stages (default: all) in dependency order.
+    Returns {stage: {"ok", "duration_s", "changed", "error"}}.
+    """
+    selected = list(STAGES) if selected is None else list(selected)
+    unknown = [s for s in selected if s not in STAGES]
+    if unknown:
+        raise ValueError(f"Unknown stage(s): {', '.join(unknown)}")
+
+    changed: Set[str] = set()
+    lock = threading.Lock()
+    results: Dict[str, Dict] = {}
+
+    def execute(name: str) -> Dict:
+        t0 = time.perf_counter()
+        with lock:
+            upstream = set(changed)
+        try:
+            with span("stage", stage=name):
+                if name == "snapshot":
+                    deps_ran = any(d in selected for d in STAGES[name]["deps"])
+                    tabs = STAGES[name]["run"](upstream, export_all=export_all, deps_ran=deps_ran)
+                else:
+                    tabs = STAGES[name]["run"](upstream)
+            res = {"ok": True, "changed": sorted(tabs or [])}
+        except BaseException as e:  # SystemExit from a script must not kill the runner
+            res = {"ok": False, "changed": [], "error": f"{type(e).__name__}: {e}"}
+        res["duration_s"] = round(time.perf_counter() - t0, 3)
+        with lock:
+            changed.update(res["changed"])
+        return res
+
+    pending = set(selected)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        running = {}
+        while pending or running:
+            ready = [
+                s for s in sorted(pending)
+                if all(d in results or d not in selected for d in STAGES[s]["deps"])
+            ]
+            for name in ready:
+                pending.discard(name)
+                running[pool.submit(execute, name)] = name
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                results[running.pop(fut)] = fut.result()
+    return results